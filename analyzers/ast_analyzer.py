@@ -1,27 +1,375 @@
 """AST Analyzer - Analyzes code using Abstract Syntax Trees."""
 
 import ast
-from typing import Any, Dict, List, Optional
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# AST node classes are never subclassed by the parser, so exact ``type() is``
+# checks against these module-level bindings replace ``isinstance`` calls.
+_FunctionDef = ast.FunctionDef
+_AsyncFunctionDef = ast.AsyncFunctionDef
+_Name = ast.Name
+_Attribute = ast.Attribute
+_AnnAssign = ast.AnnAssign
+_Expr = ast.Expr
+_Constant = ast.Constant
+_BoolOp = ast.BoolOp
+_DECISION_TYPES = frozenset((ast.If, ast.While, ast.For, ast.ExceptHandler))
+
+# Bump whenever the shape of the cached analysis changes so stale on-disk
+# entries are ignored.
+ANALYSIS_SCHEMA_VERSION = 2
+
+# Process-wide analysis results keyed by source digest (most recent last).
+_SOURCE_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_SOURCE_CACHE_SIZE = 512
+
+
+def fast_docstring(node: ast.AST, clean: bool = True) -> Optional[str]:
+    """Get the docstring of a function, class or module node.
+    
+    Equivalent to ``ast.get_docstring`` but inspects the first statement
+    directly and only runs ``inspect.cleandoc`` on multi-line docstrings;
+    a single line only needs its leading whitespace removed.
+    
+    Args:
+        node: A function, class or module AST node.
+        clean: Whether to normalize indentation like ``ast.get_docstring``.
+        
+    Returns:
+        The docstring or None.
+    """
+    body = node.body
+    if not body or type(body[0]) is not _Expr:
+        return None
+    value = body[0].value
+    if type(value) is not _Constant or type(value.value) is not str:
+        return None
+    
+    text = value.value
+    if not clean:
+        return text
+    if '\n' not in text:
+        return text.expandtabs().lstrip()
+    return inspect.cleandoc(text)
+
+
+def arg_columns(func: Dict[str, Any]) -> Tuple[Tuple[str, ...], Tuple[Optional[str], ...]]:
+    """Get the argument names and annotations of a function record.
+    
+    Uses the columnar 'arg_names'/'arg_annotations' fields when present and
+    derives them from 'args' for records built elsewhere.
+    
+    Args:
+        func: Function information dictionary.
+        
+    Returns:
+        Tuple of (argument names, argument annotations).
+    """
+    arg_names = func.get('arg_names')
+    if arg_names is not None:
+        return arg_names, func['arg_annotations']
+    
+    args = func.get('args', [])
+    return (
+        tuple(arg.get('name', '') for arg in args),
+        tuple(arg.get('annotation') for arg in args)
+    )
 
 
 class ASTAnalyzer:
     """Analyzes Python code using Abstract Syntax Trees."""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
         self.tree: Optional[ast.AST] = None
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._analyzed_tree: Optional[ast.AST] = None
+        self._analysis: Dict[str, Any] = {}
+        self._unparse_cache: Dict[ast.AST, str] = {}
+        self._function_info_cache: Dict[ast.AST, Dict[str, Any]] = {}
+        self._handlers = {
+            ast.FunctionDef: self._visit_function,
+            ast.AsyncFunctionDef: self._visit_function,
+            ast.ClassDef: self._visit_class,
+            ast.Import: self._visit_import,
+            ast.ImportFrom: self._visit_import_from,
+            ast.Call: self._visit_call,
+            ast.If: self._visit_decision,
+            ast.While: self._visit_decision,
+            ast.For: self._visit_decision,
+            ast.ExceptHandler: self._visit_decision,
+            ast.BoolOp: self._visit_bool_op
+        }
         
-    def parse(self, source_code: str) -> ast.AST:
+    def parse(self, source_code: Union[str, bytes]) -> ast.AST:
         """Parse source code into an AST.
         
         Args:
-            source_code: The source code to parse.
+            source_code: The source code to parse, as text or as raw file
+                bytes (decoded by the parser, honouring coding cookies).
             
         Returns:
             The AST tree.
         """
         self.tree = ast.parse(source_code)
+        self._unparse_cache.clear()
+        self._function_info_cache.clear()
         return self.tree
     
+    def analyze_source(self, source_code: Union[str, bytes]) -> Dict[str, Any]:
+        """Parse source code and extract its functions, classes and imports.
+        
+        Results are memoized on a hash of the source, in memory for the
+        whole process and, when ``cache_dir`` is set, on disk across runs.
+        The returned dictionary is shared between callers and must not be
+        mutated.
+        
+        Args:
+            source_code: The source code to analyze, as text or as raw file
+                bytes.
+            
+        Returns:
+            Dictionary with 'functions', 'classes', 'imports', 'calls'
+            and 'dependencies'.
+            
+        Raises:
+            SyntaxError: If the source code has syntax errors.
+        """
+        source_bytes = source_code if isinstance(source_code, bytes) else source_code.encode('utf-8')
+        digest = hashlib.blake2b(source_bytes, digest_size=16).hexdigest()
+        
+        analysis = _SOURCE_CACHE.get(digest)
+        if analysis is not None:
+            _SOURCE_CACHE.move_to_end(digest)
+            return analysis
+        
+        analysis = self._load_cached_analysis(digest)
+        if analysis is None:
+            tree = self.parse(source_code)
+            analysis = {
+                'functions': self.extract_functions(tree),
+                'classes': self.extract_classes(tree),
+                'imports': self.extract_imports(tree),
+                'calls': self.get_function_calls(tree),
+                'dependencies': self.get_dependencies(tree)
+            }
+            self._store_cached_analysis(digest, analysis)
+        
+        _SOURCE_CACHE[digest] = analysis
+        if len(_SOURCE_CACHE) > _SOURCE_CACHE_SIZE:
+            _SOURCE_CACHE.popitem(last=False)
+        return analysis
+    
+    def _cache_path(self, digest: str) -> Path:
+        """Get the on-disk cache file for a source digest."""
+        version = f'py{sys.version_info[0]}{sys.version_info[1]}'
+        return self.cache_dir / f'{digest}-{version}-v{ANALYSIS_SCHEMA_VERSION}.pickle'
+    
+    def _load_cached_analysis(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Load a previously stored analysis, if any."""
+        if self.cache_dir is None:
+            return None
+        
+        try:
+            with open(self._cache_path(digest), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            # Missing, truncated or foreign cache files (which can fail with
+            # almost any exception while unpickling) are treated as a miss
+            return None
+    
+    def _store_cached_analysis(self, digest: str, analysis: Dict[str, Any]) -> None:
+        """Store an analysis on disk; failures only cost a future re-parse."""
+        if self.cache_dir is None:
+            return
+        
+        cache_path = self._cache_path(digest)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(analysis, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    
+    def _analyze_tree(self, tree: ast.AST) -> Dict[str, Any]:
+        """Collect everything the extractors need in a single traversal.
+        
+        Nodes are visited in the same breadth-first order as ``ast.walk``,
+        but through a flat worklist instead of a generator, and each node
+        is dispatched on its exact type through a handler table. Decision
+        points are credited to the innermost enclosing function while
+        walking, and nested functions' counts are folded into their parents
+        afterwards, so complexity does not require walking each function
+        again.
+        
+        Results are cached for the most recently analyzed tree.
+        
+        Args:
+            tree: The AST tree.
+            
+        Returns:
+            Dictionary with function/class nodes, imports, calls,
+            dependencies and per-function complexity.
+        """
+        if self._analyzed_tree is tree:
+            return self._analysis
+        
+        analysis = {
+            'function_nodes': [],
+            'class_nodes': [],
+            'imports': [],
+            'calls': [],
+            'dependencies': set(),
+            'complexity': {},
+            'parent_functions': {}
+        }
+        handlers = self._handlers
+        iter_child_nodes = ast.iter_child_nodes
+        
+        nodes = [tree]
+        scopes = [None]
+        push_node = nodes.append
+        push_scope = scopes.append
+        index = 0
+        while index < len(nodes):
+            node = nodes[index]
+            scope = scopes[index]
+            index += 1
+            
+            node_type = type(node)
+            handler = handlers.get(node_type)
+            if handler is not None:
+                handler(node, scope, analysis)
+            if node_type is _FunctionDef or node_type is _AsyncFunctionDef:
+                scope = node
+            
+            for child in iter_child_nodes(node):
+                push_node(child)
+                push_scope(scope)
+        
+        # Breadth-first order lists nested functions after their parents, so
+        # walking it backwards completes each count before it is folded in.
+        complexity = analysis['complexity']
+        parent_functions = analysis['parent_functions']
+        for func_node in reversed(analysis['function_nodes']):
+            parent = parent_functions[func_node]
+            if parent is not None:
+                complexity[parent] += complexity[func_node] - 1
+        
+        self._analyzed_tree = tree
+        self._analysis = analysis
+        self._unparse_cache.clear()
+        self._function_info_cache.clear()
+        return analysis
+    
+    def _unparse(self, node: ast.AST) -> str:
+        """Unparse a node, reusing the result for nodes already serialized.
+        
+        Methods are extracted both as functions and as class members, so
+        their annotations and decorators would otherwise be unparsed twice.
+        """
+        source = self._unparse_cache.get(node)
+        if source is None:
+            source = ast.unparse(node)
+            self._unparse_cache[node] = source
+        return source
+    
+    def _visit_function(self, node: ast.AST, scope: Optional[ast.AST], analysis: Dict[str, Any]) -> None:
+        """Record a function definition and start its complexity count."""
+        analysis['function_nodes'].append(node)
+        analysis['complexity'][node] = 1  # Base complexity
+        analysis['parent_functions'][node] = scope
+    
+    def _visit_class(self, node: ast.AST, scope: Optional[ast.AST], analysis: Dict[str, Any]) -> None:
+        """Record a class definition."""
+        analysis['class_nodes'].append(node)
+    
+    def _visit_import(self, node: ast.AST, scope: Optional[ast.AST], analysis: Dict[str, Any]) -> None:
+        """Record an ``import`` statement."""
+        names = node.names
+        analysis['imports'].extend({
+            'module': alias.name,
+            'name': alias.asname or alias.name,
+            'type': 'import'
+        } for alias in names)
+        analysis['dependencies'].update(alias.name.split('.')[0] for alias in names)
+    
+    def _visit_import_from(self, node: ast.AST, scope: Optional[ast.AST], analysis: Dict[str, Any]) -> None:
+        """Record a ``from ... import`` statement."""
+        module = node.module or ''
+        analysis['imports'].extend({
+            'module': f'{module}.{alias.name}' if module else alias.name,
+            'name': alias.asname or alias.name,
+            'type': 'from_import'
+        } for alias in node.names)
+        if module:
+            analysis['dependencies'].add(module.split('.')[0])
+    
+    def _visit_call(self, node: ast.AST, scope: Optional[ast.AST], analysis: Dict[str, Any]) -> None:
+        """Record the name of a called function."""
+        func = node.func
+        func_type = type(func)
+        if func_type is _Name:
+            analysis['calls'].append(func.id)
+        elif func_type is _Attribute:
+            analysis['calls'].append(func.attr)
+    
+    def _visit_decision(self, node: ast.AST, scope: Optional[ast.AST], analysis: Dict[str, Any]) -> None:
+        """Credit a branch point to the innermost enclosing function."""
+        if scope is not None:
+            analysis['complexity'][scope] += 1
+    
+    def _visit_bool_op(self, node: ast.AST, scope: Optional[ast.AST], analysis: Dict[str, Any]) -> None:
+        """Credit and/or operands to the innermost enclosing function."""
+        if scope is not None:
+            analysis['complexity'][scope] += len(node.values) - 1
+    
+    def iter_functions(self, tree: ast.AST) -> Iterator[Dict[str, Any]]:
+        """Iterate over function definitions in the AST.
+        
+        Information for each function is only extracted when it is reached,
+        so callers that stop early skip the remaining functions.
+        
+        Args:
+            tree: The AST tree.
+            
+        Yields:
+            Function information dictionaries.
+        """
+        for node in self._analyze_tree(tree)['function_nodes']:
+            yield self._function_info(node)
+    
+    def iter_classes(self, tree: ast.AST) -> Iterator[Dict[str, Any]]:
+        """Iterate over class definitions in the AST.
+        
+        Args:
+            tree: The AST tree.
+            
+        Yields:
+            Class information dictionaries.
+        """
+        for node in self._analyze_tree(tree)['class_nodes']:
+            yield self._extract_class_info(node)
+    
+    def iter_imports(self, tree: ast.AST) -> Iterator[Dict[str, str]]:
+        """Iterate over imports in the AST.
+        
+        Args:
+            tree: The AST tree.
+            
+        Yields:
+            Import dictionaries.
+        """
+        yield from self._analyze_tree(tree)['imports']
+    
     def extract_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
         """Extract all function definitions from the AST.
         
@@ -31,17 +379,7 @@ class ASTAnalyzer:
         Returns:
             List of function information dictionaries.
         """
-        functions = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append(self._extract_function_info(node))
-            elif isinstance(node, ast.AsyncFunctionDef):
-                func_info = self._extract_function_info(node)
-                func_info['is_async'] = True
-                functions.append(func_info)
-        
-        return functions
+        return list(self.iter_functions(tree))
     
     def extract_classes(self, tree: ast.AST) -> List[Dict[str, Any]]:
         """Extract all class definitions from the AST.
@@ -52,13 +390,7 @@ class ASTAnalyzer:
         Returns:
             List of class information dictionaries.
         """
-        classes = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                classes.append(self._extract_class_info(node))
-        
-        return classes
+        return list(self.iter_classes(tree))
     
     def extract_imports(self, tree: ast.AST) -> List[Dict[str, str]]:
         """Extract all imports from the AST.
@@ -69,26 +401,19 @@ class ASTAnalyzer:
         Returns:
             List of import dictionaries.
         """
-        imports = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append({
-                        'module': alias.name,
-                        'name': alias.asname or alias.name,
-                        'type': 'import'
-                    })
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ''
-                for alias in node.names:
-                    imports.append({
-                        'module': f'{module}.{alias.name}' if module else alias.name,
-                        'name': alias.asname or alias.name,
-                        'type': 'from_import'
-                    })
-        
-        return imports
+        return list(self.iter_imports(tree))
+    
+    def _function_info(self, node: ast.FunctionDef) -> Dict[str, Any]:
+        """Get function information, extracting it at most once per node.
+        
+        Methods appear both in ``extract_functions`` and in their class's
+        ``methods``; both refer to the same (read-only) dictionary.
+        """
+        info = self._function_info_cache.get(node)
+        if info is None:
+            info = self._extract_function_info(node)
+            self._function_info_cache[node] = info
+        return info
     
     def _extract_function_info(self, node: ast.FunctionDef) -> Dict[str, Any]:
         """Extract detailed information about a function.
@@ -99,26 +424,35 @@ class ASTAnalyzer:
         Returns:
             Dictionary with function information.
         """
-        # Extract arguments
+        unparse = self._unparse
+        node_args = node.args
+        
+        # Extract arguments, both per argument and as parallel columns.
+        # Names and annotations come from a small vocabulary ('self', 'int',
+        # ...), so intern them to share one copy across all records.
+        intern = sys.intern
+        arg_names = tuple(intern(arg.arg) for arg in node_args.args)
+        arg_annotations = tuple(
+            intern(unparse(arg.annotation)) if arg.annotation else None
+            for arg in node_args.args
+        )
         args = []
-        for arg in node.args.args:
-            arg_info = {'name': arg.arg}
-            if arg.annotation:
-                arg_info['annotation'] = ast.unparse(arg.annotation)
+        for arg_name, annotation in zip(arg_names, arg_annotations):
+            arg_info = {'name': arg_name}
+            if annotation is not None:
+                arg_info['annotation'] = annotation
             args.append(arg_info)
         
         # Extract return type annotation
         return_type = None
         if node.returns:
-            return_type = ast.unparse(node.returns)
+            return_type = intern(unparse(node.returns))
         
         # Extract decorators
-        decorators = []
-        for decorator in node.decorator_list:
-            decorators.append(ast.unparse(decorator))
+        decorators = [unparse(decorator) for decorator in node.decorator_list]
         
         # Extract docstring
-        docstring = ast.get_docstring(node)
+        docstring = fast_docstring(node)
         
         # Calculate complexity (simple cyclomatic complexity)
         complexity = self._calculate_complexity(node)
@@ -126,15 +460,17 @@ class ASTAnalyzer:
         return {
             'name': node.name,
             'args': args,
+            'arg_names': arg_names,
+            'arg_annotations': arg_annotations,
             'return_type': return_type,
             'decorators': decorators,
             'docstring': docstring,
             'line_number': node.lineno,
             'complexity': complexity,
-            'is_async': isinstance(node, ast.AsyncFunctionDef),
-            'has_varargs': node.args.vararg is not None,
-            'has_kwargs': node.args.kwarg is not None,
-            'has_defaults': len(node.args.defaults) > 0
+            'is_async': type(node) is _AsyncFunctionDef,
+            'has_varargs': node_args.vararg is not None,
+            'has_kwargs': node_args.kwarg is not None,
+            'has_defaults': len(node_args.defaults) > 0
         }
     
     def _extract_class_info(self, node: ast.ClassDef) -> Dict[str, Any]:
@@ -146,33 +482,26 @@ class ASTAnalyzer:
         Returns:
             Dictionary with class information.
         """
+        unparse = self._unparse
+        
         # Extract base classes
-        bases = []
-        for base in node.bases:
-            bases.append(ast.unparse(base))
+        bases = [unparse(base) for base in node.bases]
         
-        # Extract methods
+        # Extract methods and class-level attributes
         methods = []
+        attributes = []
         for item in node.body:
-            if isinstance(item, ast.FunctionDef):
-                methods.append(self._extract_function_info(item))
-            elif isinstance(item, ast.AsyncFunctionDef):
-                method_info = self._extract_function_info(item)
-                method_info['is_async'] = True
-                methods.append(method_info)
+            item_type = type(item)
+            if item_type is _FunctionDef or item_type is _AsyncFunctionDef:
+                methods.append(self._function_info(item))
+            elif item_type is _AnnAssign and type(item.target) is _Name:
+                attributes.append({
+                    'name': item.target.id,
+                    'annotation': unparse(item.annotation) if item.annotation else None
+                })
         
         # Extract docstring
-        docstring = ast.get_docstring(node)
-        
-        # Extract class-level attributes
-        attributes = []
-        for item in node.body:
-            if isinstance(item, ast.AnnAssign):
-                if isinstance(item.target, ast.Name):
-                    attributes.append({
-                        'name': item.target.id,
-                        'annotation': ast.unparse(item.annotation) if item.annotation else None
-                    })
+        docstring = fast_docstring(node)
         
         return {
             'name': node.name,
@@ -186,24 +515,51 @@ class ASTAnalyzer:
     def _calculate_complexity(self, node: ast.FunctionDef) -> int:
         """Calculate cyclomatic complexity of a function.
         
+        Uses the counts gathered by ``_analyze_tree`` when the node belongs
+        to the analyzed tree, and falls back to walking the function.
+        
         Args:
             node: A function AST node.
             
         Returns:
             Cyclomatic complexity value.
         """
+        complexity = self._analysis.get('complexity', {}).get(node)
+        if complexity is not None:
+            return complexity
+        
         complexity = 1  # Base complexity
+        decision_types = _DECISION_TYPES
+        iter_child_nodes = ast.iter_child_nodes
         
-        for child in ast.walk(node):
+        # Visit order does not matter for counting, so use a plain stack
+        stack = [node]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            child = pop()
             # Count decision points
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
+            child_type = type(child)
+            if child_type in decision_types:
                 complexity += 1
-            elif isinstance(child, ast.BoolOp):
+            elif child_type is _BoolOp:
                 # and/or operations
                 complexity += len(child.values) - 1
+            extend(iter_child_nodes(child))
         
         return complexity
     
+    def iter_function_calls(self, tree: ast.AST) -> Iterator[str]:
+        """Iterate over function call names in the code.
+        
+        Args:
+            tree: The AST tree.
+            
+        Yields:
+            Function call names.
+        """
+        yield from self._analyze_tree(tree)['calls']
+    
     def get_function_calls(self, tree: ast.AST) -> List[str]:
         """Get all function calls in the code.
         
@@ -213,16 +569,7 @@ class ASTAnalyzer:
         Returns:
             List of function call names.
         """
-        calls = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    calls.append(node.func.id)
-                elif isinstance(node.func, ast.Attribute):
-                    calls.append(node.func.attr)
-        
-        return calls
+        return list(self.iter_function_calls(tree))
     
     def get_dependencies(self, tree: ast.AST) -> List[str]:
         """Get all module dependencies.
@@ -233,14 +580,4 @@ class ASTAnalyzer:
         Returns:
             List of module names.
         """
-        dependencies = set()
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    dependencies.add(alias.name.split('.')[0])
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    dependencies.add(node.module.split('.')[0])
-        
-        return list(dependencies)
+        return list(self._analyze_tree(tree)['dependencies'])
@@ -1,6 +1,115 @@
 """Edge Case Detector - Identifies edge cases in code for testing."""
 
-from typing import Any, Dict, List
+import functools
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from analyzers.ast_analyzer import arg_columns
+from utils.parallel import parallel_map, resolve_workers
+
+# In automatic mode, detection runs in worker processes only for inputs
+# larger than this many functions and classes.
+PARALLEL_THRESHOLD = 1000
+
+# Function-name keyword categories, in the order their edge cases are
+# reported. A keyword may belong to several categories (e.g. 'get').
+_NAME_CATEGORIES = (
+    ('division', frozenset({'divide', 'div', '/'}), (
+        "{name}: division by zero",
+        "{name}: integer overflow in division"
+    )),
+    ('ordering', frozenset({'sort', 'order', 'unique'}), (
+        "{name}: empty collection",
+        "{name}: single element collection",
+        "{name}: collection with duplicates"
+    )),
+    ('lookup', frozenset({'find', 'search', 'index', 'get'}), (
+        "{name}: item not found",
+        "{name}: empty collection"
+    )),
+    ('parsing', frozenset({'parse', 'convert', 'encode', 'decode'}), (
+        "{name}: empty string input",
+        "{name}: invalid input format",
+        "{name}: very long input"
+    )),
+    ('reading', frozenset({'read', 'load', 'fetch', 'get'}), (
+        "{name}: empty file/data",
+        "{name}: file not found",
+        "{name}: permission denied"
+    )),
+    ('writing', frozenset({'write', 'save', 'store'}), (
+        "{name}: write to read-only location",
+        "{name}: disk full"
+    ))
+)
+
+_KEYWORD_CATEGORIES: Dict[str, List[str]] = {}
+for _category, _keywords, _ in _NAME_CATEGORIES:
+    for _keyword in _keywords:
+        _KEYWORD_CATEGORIES.setdefault(_keyword, []).append(_category)
+
+# Edge-case templates for annotated arguments, keyed by annotation.
+_NUMBER_ARG_TEMPLATES = (
+    "{name}: {arg} = 0",
+    "{name}: {arg} = negative",
+    "{name}: {arg} = very large"
+)
+_STRING_ARG_TEMPLATES = (
+    "{name}: {arg} = empty string",
+    "{name}: {arg} = very long string",
+    "{name}: {arg} = special characters"
+)
+_COLLECTION_ARG_TEMPLATES = (
+    "{name}: {arg} = empty collection",
+    "{name}: {arg} = very large collection"
+)
+_ARG_TYPE_TEMPLATES = {
+    'int': _NUMBER_ARG_TEMPLATES,
+    'float': _NUMBER_ARG_TEMPLATES,
+    'number': _NUMBER_ARG_TEMPLATES,
+    'str': _STRING_ARG_TEMPLATES,
+    'string': _STRING_ARG_TEMPLATES,
+    'list': _COLLECTION_ARG_TEMPLATES,
+    'set': _COLLECTION_ARG_TEMPLATES,
+    'dict': _COLLECTION_ARG_TEMPLATES,
+    'List': _COLLECTION_ARG_TEMPLATES,
+    'Set': _COLLECTION_ARG_TEMPLATES,
+    'Dict': _COLLECTION_ARG_TEMPLATES,
+    'Collection': _COLLECTION_ARG_TEMPLATES
+}
+
+_RETURN_TYPE_TEMPLATES = {
+    'int': ("{name}: return zero", "{name}: return negative value"),
+    'float': ("{name}: return zero", "{name}: return negative value")
+}
+
+# A zero-width lookahead finds a keyword starting at every position, so
+# overlapping keywords are all reported in one scan of the name.
+_NAME_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(
+        re.escape(keyword)
+        for keyword in sorted(_KEYWORD_CATEGORIES, key=len, reverse=True)
+    ) + '))'
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _name_templates(name_lower: str) -> Tuple[str, ...]:
+    """Get the edge-case templates implied by a lowercased function name.
+    
+    Names repeat heavily across a project (dunder methods, getters, ...),
+    so the keyword scan and category resolution run once per distinct name.
+    """
+    categories = set()
+    for keyword in _NAME_KEYWORD_RE.findall(name_lower):
+        categories.update(_KEYWORD_CATEGORIES[keyword])
+    
+    templates = []
+    if categories:
+        for category, _, category_templates in _NAME_CATEGORIES:
+            if category in categories:
+                templates.extend(category_templates)
+    return tuple(templates)
 
 
 class EdgeCaseDetector:
@@ -69,35 +178,38 @@ class EdgeCaseDetector:
             ]
         }
     
-    def detect(self, functions: List[Dict], classes: List[Dict]) -> List[str]:
+    def detect(
+        self,
+        functions: List[Dict],
+        classes: List[Dict],
+        workers: Optional[int] = None
+    ) -> List[str]:
         """Detect edge cases in functions and classes.
         
         Args:
             functions: List of function information.
             classes: List of class information.
+            workers: Number of worker processes. None runs in parallel only
+                for inputs above PARALLEL_THRESHOLD; 1 always runs serially.
             
         Returns:
             List of detected edge cases.
         """
         edge_cases = []
+        workers = resolve_workers(
+            workers, len(functions) + len(classes), PARALLEL_THRESHOLD
+        )
         
         # Analyze each function
-        for func in functions:
-            edge_cases.extend(self._detect_function_edge_cases(func))
+        for func_edge_cases in parallel_map(self._detect_function_edge_cases, functions, workers):
+            edge_cases.extend(func_edge_cases)
         
         # Analyze each class
-        for cls in classes:
-            edge_cases.extend(self._detect_class_edge_cases(cls))
+        for class_edge_cases in parallel_map(self._detect_class_edge_cases, classes, workers):
+            edge_cases.extend(class_edge_cases)
         
         # Remove duplicates while preserving order
-        seen = set()
-        unique_edge_cases = []
-        for case in edge_cases:
-            if case not in seen:
-                seen.add(case)
-                unique_edge_cases.append(case)
-        
-        return unique_edge_cases
+        return list(dict.fromkeys(edge_cases))
     
     def _detect_function_edge_cases(self, func: Dict) -> List[str]:
         """Detect edge cases for a specific function.
@@ -110,64 +222,29 @@ class EdgeCaseDetector:
         """
         edge_cases = []
         func_name = func.get('name', 'unknown')
+        # One mapping per function feeds every message template
+        fields = {'name': func_name, 'arg': ''}
         
         # Check function name for hints
-        if any(keyword in func_name.lower() for keyword in ['divide', 'div', '/']):
-            edge_cases.append(f"{func_name}: division by zero")
-            edge_cases.append(f"{func_name}: integer overflow in division")
-        
-        if any(keyword in func_name.lower() for keyword in ['sort', 'order', 'unique']):
-            edge_cases.append(f"{func_name}: empty collection")
-            edge_cases.append(f"{func_name}: single element collection")
-            edge_cases.append(f"{func_name}: collection with duplicates")
-        
-        if any(keyword in func_name.lower() for keyword in ['find', 'search', 'index', 'get']):
-            edge_cases.append(f"{func_name}: item not found")
-            edge_cases.append(f"{func_name}: empty collection")
-        
-        if any(keyword in func_name.lower() for keyword in ['parse', 'convert', 'encode', 'decode']):
-            edge_cases.append(f"{func_name}: empty string input")
-            edge_cases.append(f"{func_name}: invalid input format")
-            edge_cases.append(f"{func_name}: very long input")
-        
-        if any(keyword in func_name.lower() for keyword in ['read', 'load', 'fetch', 'get']):
-            edge_cases.append(f"{func_name}: empty file/data")
-            edge_cases.append(f"{func_name}: file not found")
-            edge_cases.append(f"{func_name}: permission denied")
-        
-        if any(keyword in func_name.lower() for keyword in ['write', 'save', 'store']):
-            edge_cases.append(f"{func_name}: write to read-only location")
-            edge_cases.append(f"{func_name}: disk full")
+        edge_cases.extend(
+            template.format_map(fields) for template in _name_templates(func_name.lower())
+        )
         
         # Check arguments for type hints
-        args = func.get('args', [])
-        for arg in args:
-            arg_name = arg.get('name', '')
-            arg_type = arg.get('annotation', '')
-            
-            # Numeric arguments
-            if arg_type in ['int', 'float', 'number']:
-                edge_cases.append(f"{func_name}: {arg_name} = 0")
-                edge_cases.append(f"{func_name}: {arg_name} = negative")
-                edge_cases.append(f"{func_name}: {arg_name} = very large")
-            
-            # String arguments
-            if arg_type in ['str', 'string']:
-                edge_cases.append(f"{func_name}: {arg_name} = empty string")
-                edge_cases.append(f"{func_name}: {arg_name} = very long string")
-                edge_cases.append(f"{func_name}: {arg_name} = special characters")
-            
-            # Collection arguments
-            if arg_type in ['list', 'set', 'dict', 'List', 'Set', 'Dict', 'Collection']:
-                edge_cases.append(f"{func_name}: {arg_name} = empty collection")
-                edge_cases.append(f"{func_name}: {arg_name} = very large collection")
+        arg_names, arg_annotations = arg_columns(func)
+        for arg_name, arg_type in zip(arg_names, arg_annotations):
+            # Numeric, string and collection arguments
+            templates = _ARG_TYPE_TEMPLATES.get(arg_type)
+            if templates:
+                fields['arg'] = arg_name
+                edge_cases.extend(template.format_map(fields) for template in templates)
         
         # Check return type
         return_type = func.get('return_type')
         if return_type:
-            if return_type in ['int', 'float']:
-                edge_cases.append(f"{func_name}: return zero")
-                edge_cases.append(f"{func_name}: return negative value")
+            templates = _RETURN_TYPE_TEMPLATES.get(return_type)
+            if templates:
+                edge_cases.extend(template.format_map(fields) for template in templates)
         
         # Check for potential issues based on complexity
         complexity = func.get('complexity', 0)
@@ -234,15 +311,13 @@ class EdgeCaseDetector:
         Returns:
             List of test case dictionaries.
         """
-        test_cases = []
         edge_cases = self._detect_function_edge_cases(func)
         
-        for edge_case in edge_cases:
-            test_case = {
+        return [
+            {
                 'name': edge_case,
                 'description': f"Test case for {edge_case}",
                 'type': 'edge_case'
             }
-            test_cases.append(test_case)
-        
-        return test_cases
+            for edge_case in edge_cases
+        ]
@@ -1,6 +1,60 @@
 """Failure Mode Detector - Identifies common failure patterns in code."""
 
-from typing import Any, Dict, List
+import re
+from typing import Any, Dict, List, Optional
+
+from analyzers.ast_analyzer import arg_columns
+from utils.parallel import parallel_map, resolve_workers
+
+# In automatic mode, detection runs in worker processes only for inputs
+# larger than this many functions and classes.
+PARALLEL_THRESHOLD = 1000
+
+# Function-name keyword groups that hint at failure modes.
+_LOOKUP_KEYWORDS = frozenset({'get', 'find', 'search'})
+_PARSING_KEYWORDS = frozenset({'parse', 'load', 'read'})
+_REMOVAL_KEYWORDS = frozenset({'delete', 'remove'})
+_VALIDATION_KEYWORDS = frozenset({'validate', 'check'})
+_RECURSION_KEYWORDS = frozenset({'recursive'})
+
+# Characters replaced when turning a failure mode into a test name.
+_TEST_NAME_TRANSLATION = str.maketrans({' ': '_', ':': '_'})
+
+# A zero-width lookahead finds every (possibly overlapping) keyword that
+# occurs in a lowercased name in one scan; groups are then tested by set
+# intersection.
+_NAME_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(
+        re.escape(keyword)
+        for keyword in sorted(
+            _LOOKUP_KEYWORDS | _PARSING_KEYWORDS | _REMOVAL_KEYWORDS
+            | _VALIDATION_KEYWORDS | _RECURSION_KEYWORDS,
+            key=len,
+            reverse=True
+        )
+    ) + '))'
+)
+
+# Failure-mode templates for annotated arguments, keyed by annotation.
+_COLLECTION_ARG_TEMPLATES = (
+    "{name}: may not handle empty {arg}",
+    "{name}: may not handle None {arg}"
+)
+_SCALAR_ARG_TEMPLATES = (
+    "{name}: may not validate {arg} type",
+)
+_ARG_TYPE_TEMPLATES = {
+    'list': _COLLECTION_ARG_TEMPLATES,
+    'List': _COLLECTION_ARG_TEMPLATES,
+    'dict': _COLLECTION_ARG_TEMPLATES,
+    'Dict': _COLLECTION_ARG_TEMPLATES,
+    'set': _COLLECTION_ARG_TEMPLATES,
+    'Set': _COLLECTION_ARG_TEMPLATES,
+    'int': _SCALAR_ARG_TEMPLATES,
+    'float': _SCALAR_ARG_TEMPLATES,
+    'str': _SCALAR_ARG_TEMPLATES,
+    'bool': _SCALAR_ARG_TEMPLATES
+}
 
 
 class FailureModeDetector:
@@ -65,35 +119,38 @@ class FailureModeDetector:
             ]
         }
     
-    def detect(self, functions: List[Dict], classes: List[Dict]) -> List[str]:
+    def detect(
+        self,
+        functions: List[Dict],
+        classes: List[Dict],
+        workers: Optional[int] = None
+    ) -> List[str]:
         """Detect failure modes in functions and classes.
         
         Args:
             functions: List of function information.
             classes: List of class information.
+            workers: Number of worker processes. None runs in parallel only
+                for inputs above PARALLEL_THRESHOLD; 1 always runs serially.
             
         Returns:
             List of detected failure modes.
         """
         failure_modes = []
+        workers = resolve_workers(
+            workers, len(functions) + len(classes), PARALLEL_THRESHOLD
+        )
         
         # Analyze each function
-        for func in functions:
-            failure_modes.extend(self._detect_function_failure_modes(func))
+        for func_failure_modes in parallel_map(self._detect_function_failure_modes, functions, workers):
+            failure_modes.extend(func_failure_modes)
         
         # Analyze each class
-        for cls in classes:
-            failure_modes.extend(self._detect_class_failure_modes(cls))
+        for class_failure_modes in parallel_map(self._detect_class_failure_modes, classes, workers):
+            failure_modes.extend(class_failure_modes)
         
         # Remove duplicates while preserving order
-        seen = set()
-        unique_failure_modes = []
-        for mode in failure_modes:
-            if mode not in seen:
-                seen.add(mode)
-                unique_failure_modes.append(mode)
-        
-        return unique_failure_modes
+        return list(dict.fromkeys(failure_modes))
     
     def _detect_function_failure_modes(self, func: Dict) -> List[str]:
         """Detect failure modes for a specific function.
@@ -108,36 +165,34 @@ class FailureModeDetector:
         func_name = func.get('name', 'unknown')
         
         # Check function name for hints about potential failures
-        if any(keyword in func_name.lower() for keyword in ['get', 'find', 'search']):
+        name_keywords = frozenset(_NAME_KEYWORD_RE.findall(func_name.lower()))
+        
+        if name_keywords & _LOOKUP_KEYWORDS:
             failure_modes.append(f"{func_name}: may return None without indication")
             failure_modes.append(f"{func_name}: may raise exception when not found")
         
-        if any(keyword in func_name.lower() for keyword in ['parse', 'load', 'read']):
+        if name_keywords & _PARSING_KEYWORDS:
             failure_modes.append(f"{func_name}: may raise parsing error on invalid input")
             failure_modes.append(f"{func_name}: may not handle malformed data")
         
-        if any(keyword in func_name.lower() for keyword in ['delete', 'remove']):
+        if name_keywords & _REMOVAL_KEYWORDS:
             failure_modes.append(f"{func_name}: may fail silently on non-existent item")
             failure_modes.append(f"{func_name}: may raise exception when item not found")
         
-        if any(keyword in func_name.lower() for keyword in ['validate', 'check']):
+        if name_keywords & _VALIDATION_KEYWORDS:
             failure_modes.append(f"{func_name}: may have incomplete validation")
         
         # Check arguments
-        args = func.get('args', [])
+        arg_names, arg_annotations = arg_columns(func)
+        fields = {'name': func_name, 'arg': ''}
         
         # Check for missing validation opportunities
-        for arg in args:
-            arg_name = arg.get('name', '')
-            arg_type = arg.get('annotation', '')
-            
+        for arg_name, arg_type in zip(arg_names, arg_annotations):
             # Check for common missing validations
-            if arg_type in ['list', 'List', 'dict', 'Dict', 'set', 'Set']:
-                failure_modes.append(f"{func_name}: may not handle empty {arg_name}")
-                failure_modes.append(f"{func_name}: may not handle None {arg_name}")
-            
-            if arg_type in ['int', 'float', 'str', 'bool']:
-                failure_modes.append(f"{func_name}: may not validate {arg_name} type")
+            templates = _ARG_TYPE_TEMPLATES.get(arg_type)
+            if templates:
+                fields['arg'] = arg_name
+                failure_modes.extend(template.format_map(fields) for template in templates)
         
         # Check return type
         return_type = func.get('return_type')
@@ -157,7 +212,7 @@ class FailureModeDetector:
         
         # Check for recursion
         func_body = func.get('body', '')
-        if 'recursive' in func_name.lower() or 'recursion' in str(func_body).lower():
+        if name_keywords & _RECURSION_KEYWORDS or 'recursion' in str(func_body).lower():
             failure_modes.append(f"{func_name}: recursive function - stack overflow risk")
             failure_modes.append(f"{func_name}: recursive function - missing base case risk")
         
@@ -233,16 +288,14 @@ class FailureModeDetector:
         Returns:
             List of critical test cases.
         """
-        tests = []
         failure_modes = self.detect(functions, classes)
         
-        for mode in failure_modes:
-            test = {
-                'name': f"Test_{mode.replace(' ', '_').replace(':', '_')}",
+        return [
+            {
+                'name': f"Test_{mode.translate(_TEST_NAME_TRANSLATION)}",
                 'description': mode,
                 'type': 'failure_mode',
                 'critical': True
             }
-            tests.append(test)
-        
-        return tests
+            for mode in failure_modes
+        ]
@@ -1,9 +1,144 @@
 """Property-Based Test Generator - Generates property-based tests using Hypothesis."""
 
+import re
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime
 
+from analyzers.ast_analyzer import arg_columns
+from utils.parallel import parallel_calls, resolve_workers
+
+# In automatic mode, test files are written by worker processes only for
+# inputs larger than this many functions and classes.
+PARALLEL_THRESHOLD = 1000
+
+# Test files are streamed to disk through a buffer of this many bytes
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+# File headers written at the top of each generated test module
+_HEADER_PROPERTY_FUNCTIONS = (
+    '"""Property-based tests for functions using Hypothesis."""\n'
+    '\n'
+    'from hypothesis import given, settings, assume\n'
+    'from hypothesis import strategies as st\n'
+    'import pytest\n'
+    '\n'
+)
+
+_HEADER_PROPERTY_CLASSES = (
+    '"""Property-based tests for classes using Hypothesis."""\n'
+    '\n'
+    'from hypothesis import given, settings, assume\n'
+    'from hypothesis import strategies as st\n'
+    'import pytest\n'
+    '\n'
+)
+
+# Hypothesis strategies for plain (unparameterised) type hints
+_TYPE_STRATEGY = {
+    'int': 'st.integers(min_value=-1000, max_value=1000)',
+    'float': 'st.floats(min_value=-1000, max_value=1000, allow_nan=False, allow_infinity=False)',
+    'str': 'st.text(min_size=0, max_size=100)',
+    'bool': 'st.booleans()',
+    'list': 'st.lists(st.integers(), max_size=10)',
+    'List': 'st.lists(st.integers(), max_size=10)',
+    'dict': 'st.dictionaries(st.text(), st.integers(), max_size=10)',
+    'Dict': 'st.dictionaries(st.text(), st.integers(), max_size=10)',
+    'set': 'st.sets(st.integers(), max_size=10)',
+    'Set': 'st.sets(st.integers(), max_size=10)',
+    'tuple': 'st.tuples(st.integers(), st.integers())',
+    'Tuple': 'st.tuples(st.integers(), st.integers())',
+    'bytes': 'st.binary(min_size=0, max_size=100)',
+    'bytearray': 'st.binary(min_size=0, max_size=100)',
+}
+
+_UNION_STRATEGY = f"st.one_of({_TYPE_STRATEGY['int']}, st.none())"
+
+_OPTIONAL_RE = re.compile(r'^Optional\[(.+)\]$')
+
+# Test code templates, filled in with %-formatting on a mapping.
+_FUNCTION_PROPERTY_TEMPLATE = (
+    '@given(\n'
+    '%(params)s'
+    ')\n'
+    '@settings(max_examples=100)\n'
+    'def test_%(name)s_propertybased(%(signature)s):\n'
+    '    """Property-based test for %(name)s."""\n'
+    '    result = %(name)s(%(signature)s)\n'
+    '    # Property: Result should not be None for valid inputs\n'
+    '    # assert result is not None\n'
+    '\n'
+    '%(assertions)s'
+    '\n'
+)
+
+_NUMBER_ASSERTIONS = (
+    '    # Property: Result should be a number\n'
+    '    # assert isinstance(result, (int, float))\n'
+)
+_STRING_ASSERTIONS = (
+    '    # Property: Result should be a string\n'
+    '    # assert isinstance(result, str)\n'
+)
+_BOOLEAN_ASSERTIONS = (
+    '    # Property: Result should be a boolean\n'
+    '    # assert isinstance(result, bool)\n'
+)
+
+# Extra assertions keyed by the function's return annotation
+_RETURN_TYPE_ASSERTIONS = {
+    'int': _NUMBER_ASSERTIONS,
+    'float': _NUMBER_ASSERTIONS,
+    'str': _STRING_ASSERTIONS,
+    'String': _STRING_ASSERTIONS,
+    'bool': _BOOLEAN_ASSERTIONS,
+    'Boolean': _BOOLEAN_ASSERTIONS,
+}
+
+_INVERSE_PROPERTY_TEMPLATE = (
+    '@given(value=st.text())\n'
+    '@settings(max_examples=50)\n'
+    'def test_%(name)s_inverse_property(value):\n'
+    '    """Test inverse property: decode(encode(x)) == x."""\n'
+    '    # encoded = %(name)s(value)\n'
+    '    # decoded = decode(encoded)\n'
+    '    # assert decoded == value\n'
+    '\n'
+)
+
+_CONSISTENCY_PROPERTY_TEMPLATE = (
+    '@given(value=st.integers(min_value=0, max_value=100))\n'
+    '@settings(max_examples=50)\n'
+    'def test_%(name)s_consistency(value):\n'
+    '    """Test consistency: Same input should give same output."""\n'
+    '    # result1 = %(name)s(value)\n'
+    '    # result2 = %(name)s(value)\n'
+    '    # assert result1 == result2\n'
+    '\n'
+)
+
+_CLASS_INIT_PROPERTY_TEMPLATE = (
+    '@given(data=st.data())\n'
+    '@settings(max_examples=50)\n'
+    'def test_%(class_name)s_initialization_property(data):\n'
+    '    """Property-based test for %(class_name)s initialization."""\n'
+    '    # Test that class can be initialized with valid inputs\n'
+    '    # Add your initialization strategies\n'
+    '\n'
+)
+
+_METHOD_PROPERTY_TEMPLATE = (
+    '@given(value=st.integers())\n'
+    '@settings(max_examples=50)\n'
+    'def test_%(class_name)s_%(method_name)s_property(value):\n'
+    '    """Property-based test for %(class_name)s.%(method_name)s."""\n'
+    '    # instance = %(class_name)s()\n'
+    '    # result = instance.%(method_name)s(value)\n'
+    '    # assert result is not None  # Add property assertions\n'
+    '\n'
+)
+
 
 class PropertyBasedTestGenerator:
     """Generates property-based tests using Hypothesis."""
@@ -11,40 +146,45 @@ class PropertyBasedTestGenerator:
     def __init__(self):
         self.test_count = 0
         
-    def generate(self, analysis: Dict[str, Any], output_path: Path) -> List[str]:
+    def generate(
+        self,
+        analysis: Dict[str, Any],
+        output_path: Path,
+        workers: Optional[int] = None
+    ) -> List[str]:
         """Generate property-based tests based on analysis results.
         
         Args:
             analysis: Analysis results containing functions and classes.
             output_path: Path to output directory for test files.
+            workers: Number of worker processes. None writes the files in
+                parallel only for inputs above PARALLEL_THRESHOLD; 1 always
+                runs serially.
             
         Returns:
             List of generated test file paths.
         """
-        generated_files = []
-        
         functions = analysis.get('functions', [])
         classes = analysis.get('classes', [])
         
+        calls = []
+        
         # Generate property-based tests for functions
         if functions:
-            test_file = self._generate_function_property_tests(functions, output_path)
-            if test_file:
-                generated_files.append(test_file)
+            calls.append((self._generate_function_property_tests, (functions, output_path)))
         
         # Generate property-based tests for classes
         if classes:
-            test_file = self._generate_class_property_tests(classes, output_path)
-            if test_file:
-                generated_files.append(test_file)
+            calls.append((self._generate_class_property_tests, (classes, output_path)))
         
-        return generated_files
+        workers = resolve_workers(workers, len(functions) + len(classes), PARALLEL_THRESHOLD)
+        return [test_file for test_file in parallel_calls(calls, workers) if test_file]
     
     def _generate_function_property_tests(
         self, 
         functions: List[Dict], 
         output_path: Path
-    ) -> str:
+    ) -> Optional[str]:
         """Generate property-based tests for functions.
         
         Args:
@@ -52,191 +192,65 @@ class PropertyBasedTestGenerator:
             output_path: Path to output directory.
             
         Returns:
-            Path to generated test file.
+            Path to generated test file, or None if there was nothing to test.
         """
         test_file = output_path / "test_property_functions.py"
         
-        test_content = []
-        test_content.append('"""Property-based tests for functions using Hypothesis."""')
-        test_content.append('')
-        test_content.append('from hypothesis import given, settings, assume')
-        test_content.append('from hypothesis import strategies as st')
-        test_content.append('import pytest')
-        test_content.append('')
-        
+        public_functions = []
         for func in functions:
             # Skip private functions
             func_name = func.get('name', '')
             if func_name.startswith('_') and not func_name.startswith('__'):
                 continue
-            
-            test_content.extend(self._generate_function_property_test(func))
-            test_content.append('')
+            public_functions.append(func)
         
-        # Write test file
-        with open(test_file, 'w') as f:
-            f.write('\n'.join(test_content))
+        # Nothing public to test, so don't write a header-only file
+        if not public_functions:
+            return None
+        
+        with open(
+            test_file, 'w', encoding='utf-8', newline='\n', buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            f.write(_HEADER_PROPERTY_FUNCTIONS)
+            
+            for func in public_functions:
+                f.writelines(self._generate_function_property_test(func))
+                f.write('\n')
         
         return str(test_file)
     
-    def _generate_function_property_test(self, func: Dict) -> List[str]:
+    def _generate_function_property_test(self, func: Dict) -> Iterator[str]:
         """Generate property-based test for a single function.
         
         Args:
             func: Function information dictionary.
             
-        Returns:
-            List of test case code lines.
+        Yields:
+            Rendered test code blocks.
         """
         func_name = func.get('name', 'unknown')
-        args = func.get('args', [])
         
-        test_cases = []
-        
-        # Generate strategies for each argument
-        strategies = []
-        for arg in args:
-            arg_name = arg.get('name', 'arg')
-            arg_type = arg.get('annotation', '')
-            strategy = self._get_strategy_for_type(arg_type, arg_name)
-            strategies.append(strategy)
+        # Read each argument's name and annotation once
+        arg_names, arg_annotations = arg_columns(func)
+        params = [
+            f'    {arg_name}={self._get_strategy_for_type(annotation or "", arg_name)}'
+            for arg_name, annotation in zip(arg_names, arg_annotations)
+        ]
         
         # Generate property test
-        test_cases.append(f'@given(')
-        for i, strategy in enumerate(strategies):
-            if i > 0:
-                test_cases[-1] += ', '
-            arg_name = args[i].get('name', f'arg{i}')
-            test_cases.append(f'    {arg_name}={strategy}')
-        test_cases.append(')')
-        test_cases.append('@settings(max_examples=100)')
-        test_cases.append(f'def test_{func_name}_propertybased({", ".join([a.get("name", f"arg{i}") for i, a in enumerate(args)])}):')
-        test_cases.append(f'    """Property-based test for {func_name}."""')
-        
-        # Add assumptions for valid inputs
-        test_cases.extend(self._generate_assumptions(func))
-        
-        # Call the function
-        call_args = ', '.join([a.get('name', f'arg{i}') for i, a in enumerate(args)])
-        test_cases.append(f'    result = {func_name}({call_args})')
-        
-        # Add property assertions
-        test_cases.extend(self._generate_property_assertions(func))
-        
-        test_cases.append('')
+        yield _FUNCTION_PROPERTY_TEMPLATE % {
+            'name': func_name,
+            'params': ', \n'.join(params) + '\n' if params else '',
+            'signature': ', '.join(arg_names),
+            'assertions': _RETURN_TYPE_ASSERTIONS.get(func.get('return_type') or '', '')
+        }
         
         # Generate inverse property tests
-        test_cases.extend(self._generate_inverse_property_test(func))
-        
-        # Generate consistency property tests
-        test_cases.extend(self._generate_consistency_property_test(func))
-        
-        return test_cases
-    
-    def _generate_assumptions(self, func: Dict) -> List[str]:
-        """Generate Hypothesis assumptions for valid inputs.
-        
-        Args:
-            func: Function information dictionary.
-            
-        Returns:
-            List of assumption code lines.
-        """
-        assumptions = []
-        args = func.get('args', [])
-        
-        for arg in args:
-            arg_type = arg.get('annotation', '')
-            arg_name = arg.get('name', '')
-            
-            # Add assumptions based on type
-            if arg_type in ['int', 'float']:
-                assumptions.append(f'    assume({arg_name} is not None)')
-                assumptions.append(f'    assume(not (isinstance({arg_name}, float) and ({arg_name} != {arg_name})))')  # Not NaN
-            elif arg_type in ['str', 'String']:
-                assumptions.append(f'    assume({arg_name} is not None)')
-        
-        return assumptions
-    
-    def _generate_property_assertions(self, func: Dict) -> List[str]:
-        """Generate property assertions for a function.
-        
-        Args:
-            func: Function information dictionary.
-            
-        Returns:
-            List of assertion code lines.
-        """
-        assertions = []
-        func_name = func.get('name', 'unknown')
-        
-        # Generic property assertions
-        assertions.append(f'    # Property: Result should not be None for valid inputs')
-        assertions.append(f'    # assert result is not None')
-        assertions.append('')
-        
-        # Type-specific properties
-        return_type = func.get('return_type', '')
-        if return_type in ['int', 'float']:
-            assertions.append(f'    # Property: Result should be a number')
-            assertions.append(f'    # assert isinstance(result, (int, float))')
-        elif return_type in ['str', 'String']:
-            assertions.append(f'    # Property: Result should be a string')
-            assertions.append(f'    # assert isinstance(result, str)')
-        elif return_type in ['bool', 'Boolean']:
-            assertions.append(f'    # Property: Result should be a boolean')
-            assertions.append(f'    # assert isinstance(result, bool)')
-        
-        return assertions
-    
-    def _generate_inverse_property_test(self, func: Dict) -> List[str]:
-        """Generate inverse property test.
-        
-        Args:
-            func: Function information dictionary.
-            
-        Returns:
-            List of test code lines.
-        """
-        func_name = func.get('name', 'unknown')
-        
-        # Check if function name suggests invertibility
         if any(keyword in func_name.lower() for keyword in ['encode', 'encrypt', 'serialize']):
-            test = []
-            test.append(f'@given(value=st.text())')
-            test.append('@settings(max_examples=50)')
-            test.append(f'def test_{func_name}_inverse_property(value):')
-            test.append(f'    """Test inverse property: decode(encode(x)) == x."""')
-            test.append(f'    # encoded = {func_name}(value)')
-            test.append(f'    # decoded = decode(encoded)')
-            test.append(f'    # assert decoded == value')
-            test.append('')
-            return test
-        
-        return []
-    
-    def _generate_consistency_property_test(self, func: Dict) -> List[str]:
-        """Generate consistency property test.
-        
-        Args:
-            func: Function information dictionary.
-            
-        Returns:
-            List of test code lines.
-        """
-        func_name = func.get('name', 'unknown')
-        
-        test = []
-        test.append(f'@given(value=st.integers(min_value=0, max_value=100))')
-        test.append('@settings(max_examples=50)')
-        test.append(f'def test_{func_name}_consistency(value):')
-        test.append(f'    """Test consistency: Same input should give same output."""')
-        test.append(f'    # result1 = {func_name}(value)')
-        test.append(f'    # result2 = {func_name}(value)')
-        test.append(f'    # assert result1 == result2')
-        test.append('')
+            yield _INVERSE_PROPERTY_TEMPLATE % {'name': func_name}
         
-        return test
+        # Generate consistency property tests
+        yield _CONSISTENCY_PROPERTY_TEMPLATE % {'name': func_name}
     
     def _get_strategy_for_type(self, type_hint: str, arg_name: str) -> str:
         """Get Hypothesis strategy for a given type hint.
@@ -248,38 +262,23 @@ class PropertyBasedTestGenerator:
         Returns:
             Hypothesis strategy as a string.
         """
-        # Handle Optional types
-        if 'Optional[' in type_hint:
-            type_hint = type_hint.replace('Optional[', '').rstrip(']')
-        
         # Handle Union types
         if 'Union[' in type_hint:
-            return f'st.one_of({self._get_strategy_for_type("int", arg_name)}, st.none())'
+            return _UNION_STRATEGY
         
-        type_mapping = {
-            'int': 'st.integers(min_value=-1000, max_value=1000)',
-            'float': 'st.floats(min_value=-1000, max_value=1000, allow_nan=False, allow_infinity=False)',
-            'str': 'st.text(min_size=0, max_size=100)',
-            'bool': 'st.booleans()',
-            'list': 'st.lists(st.integers(), max_size=10)',
-            'List': 'st.lists(st.integers(), max_size=10)',
-            'dict': 'st.dictionaries(st.text(), st.integers(), max_size=10)',
-            'Dict': 'st.dictionaries(st.text(), st.integers(), max_size=10)',
-            'set': 'st.sets(st.integers(), max_size=10)',
-            'Set': 'st.sets(st.integers(), max_size=10)',
-            'tuple': 'st.tuples(st.integers(), st.integers())',
-            'Tuple': 'st.tuples(st.integers(), st.integers())',
-            'bytes': 'st.binary(min_size=0, max_size=100)',
-            'bytearray': 'st.binary(min_size=0, max_size=100)',
-        }
+        # Handle (possibly nested) Optional types
+        match = _OPTIONAL_RE.match(type_hint)
+        while match:
+            type_hint = match.group(1)
+            match = _OPTIONAL_RE.match(type_hint)
         
-        return type_mapping.get(type_hint, 'st.none()')
+        return _TYPE_STRATEGY.get(type_hint, 'st.none()')
     
     def _generate_class_property_tests(
         self, 
         classes: List[Dict], 
         output_path: Path
-    ) -> str:
+    ) -> Optional[str]:
         """Generate property-based tests for classes.
         
         Args:
@@ -287,53 +286,40 @@ class PropertyBasedTestGenerator:
             output_path: Path to output directory.
             
         Returns:
-            Path to generated test file.
+            Path to generated test file, or None if there was nothing to test.
         """
         test_file = output_path / "test_property_classes.py"
         
-        test_content = []
-        test_content.append('"""Property-based tests for classes using Hypothesis."""')
-        test_content.append('')
-        test_content.append('from hypothesis import given, settings, assume')
-        test_content.append('from hypothesis import strategies as st')
-        test_content.append('import pytest')
-        test_content.append('')
+        public_classes = [cls for cls in classes if not cls.get('name', '').startswith('_')]
         
-        for cls in classes:
-            class_name = cls.get('name', '')
-            if class_name.startswith('_'):
-                continue
-            
-            test_content.extend(self._generate_class_property_test(cls))
-            test_content.append('')
+        # Nothing public to test, so don't write a header-only file
+        if not public_classes:
+            return None
         
-        # Write test file
-        with open(test_file, 'w') as f:
-            f.write('\n'.join(test_content))
+        with open(
+            test_file, 'w', encoding='utf-8', newline='\n', buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            f.write(_HEADER_PROPERTY_CLASSES)
+            
+            for cls in public_classes:
+                f.writelines(self._generate_class_property_test(cls))
+                f.write('\n')
         
         return str(test_file)
     
-    def _generate_class_property_test(self, cls: Dict) -> List[str]:
+    def _generate_class_property_test(self, cls: Dict) -> Iterator[str]:
         """Generate property-based test for a class.
         
         Args:
             cls: Class information dictionary.
             
-        Returns:
-            List of test case code lines.
+        Yields:
+            Rendered test code blocks.
         """
         class_name = cls.get('name', 'unknown')
         
-        test_cases = []
-        
         # Test initialization property
-        test_cases.append('@given(data=st.data())')
-        test_cases.append('@settings(max_examples=50)')
-        test_cases.append(f'def test_{class_name}_initialization_property(data):')
-        test_cases.append(f'    """Property-based test for {class_name} initialization."""')
-        test_cases.append(f'    # Test that class can be initialized with valid inputs')
-        test_cases.append(f'    # Add your initialization strategies')
-        test_cases.append('')
+        yield _CLASS_INIT_PROPERTY_TEMPLATE % {'class_name': class_name}
         
         # Test method properties
         methods = cls.get('methods', [])
@@ -344,35 +330,7 @@ class PropertyBasedTestGenerator:
             if method_name == '__init__':
                 continue
                 
-            test_cases.extend(self._generate_method_property_test(class_name, method))
-        
-        return test_cases
-    
-    def _generate_method_property_test(
-        self, 
-        class_name: str, 
-        method: Dict
-    ) -> List[str]:
-        """Generate property-based test for a class method.
-        
-        Args:
-            class_name: Name of the class.
-            method: Method information dictionary.
-            
-        Returns:
-            List of test case code lines.
-        """
-        method_name = method.get('name', 'unknown')
-        
-        test_cases = []
-        
-        test_cases.append(f'@given(value=st.integers())')
-        test_cases.append('@settings(max_examples=50)')
-        test_cases.append(f'def test_{class_name}_{method_name}_property(value):')
-        test_cases.append(f'    """Property-based test for {class_name}.{method_name}."""')
-        test_cases.append(f'    # instance = {class_name}()')
-        test_cases.append(f'    # result = instance.{method_name}(value)')
-        test_cases.append(f'    # assert result is not None  # Add property assertions')
-        test_cases.append('')
-        
-        return test_cases
+            yield _METHOD_PROPERTY_TEMPLATE % {
+                'class_name': class_name,
+                'method_name': method.get('name', 'unknown')
+            }
@@ -1,10 +1,194 @@
 """Unit Test Generator - Generates unit tests for functions and classes."""
 
 import ast
+import functools
+import io
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, TextIO, Tuple
 from datetime import datetime
 
+from utils.parallel import parallel_imap, resolve_workers
+
+# In automatic mode, tests are rendered by worker processes only for inputs
+# larger than this many functions and classes.
+PARALLEL_THRESHOLD = 1000
+
+# Number of functions or classes sent to a render worker at a time
+_RENDER_CHUNKSIZE = 32
+
+# Test files are streamed to disk through a buffer of this many bytes
+_WRITE_BUFFER_SIZE = 1 << 16
+
+# File header written at the top of the generated test module
+_HEADER_UNIT = (
+    '"""Unit tests for functions and classes."""\n'
+    '\n'
+    'import pytest\n'
+    'from unittest.mock import Mock, patch, MagicMock\n'
+    '\n'
+    '\n'
+)
+
+# Test code templates, filled in with %-formatting on a mapping.
+_BASIC_TEST_TEMPLATE = (
+    'def test_%(name)s_basic():\n'
+    '    # Test %(name)s with basic inputs\n'
+    '    result = %(name)s(%(args)s)\n'
+    '    assert result is not None  # Add your assertion\n'
+    '\n'
+)
+
+_NO_ARGS_TEST_TEMPLATE = (
+    'def test_%(name)s_basic():\n'
+    '    # Test %(name)s with no arguments\n'
+    '    result = %(name)s()\n'
+    '    assert result is not None  # Add your assertion\n'
+    '\n'
+)
+
+_NONE_ARG_TEST_TEMPLATE = (
+    'def test_%(name)s_%(arg)s_none():\n'
+    '    # Test with None value\n'
+    '    # result = %(name)s(%(args)s)\n'
+    '    # Add your assertion or expect error\n'
+    '\n'
+)
+
+_EMPTY_ARG_TEST_TEMPLATE = (
+    'def test_%(name)s_%(arg)s_empty():\n'
+    '    # Test with empty %(type)s\n'
+    '    # result = %(name)s(%(args)s)\n'
+    '    # Add your assertion\n'
+    '\n'
+)
+
+_ERROR_TEST_TEMPLATE = (
+    'def test_%(name)s_raises_on_invalid_input():\n'
+    '    # Test that function raises appropriate exceptions\n'
+    '    with pytest.raises((ValueError, TypeError)):\n'
+    '        %(name)s(invalid_input)\n'
+    '\n'
+)
+
+_CLASS_INIT_TEST_TEMPLATE = (
+    '# Tests for %(class_name)s\n'
+    '\n'
+    'def test_%(class_name)s_init():\n'
+    '    # Test class initialization\n'
+    '    # instance = %(class_name)s()\n'
+    '    # Add your assertions\n'
+    '\n'
+)
+
+_CLASS_METHOD_TEST_TEMPLATE = (
+    'def test_%(class_name)s_%(method_name)s():\n'
+    '    # Test %(method_name)s method\n'
+    '    # result = %(class_name)s.%(method_name)s(%(args)s)\n'
+    '    # Add your assertions\n'
+    '\n'
+)
+
+_INSTANCE_METHOD_TEST_TEMPLATE = (
+    'def test_%(class_name)s_%(method_name)s():\n'
+    '    # Test %(method_name)s method\n'
+    '    # instance = %(class_name)s()\n'
+    '    # result = instance.%(method_name)s(%(args)s)\n'
+    '    # Add your assertions\n'
+    '\n'
+)
+
+# Test values for plain (unsubscripted) type hints
+_TYPE_TEST_VALUES = {
+    'int': '1',
+    'float': '1.0',
+    'str': '"test"',
+    'bool': 'True',
+    'list': '[]',
+    'List': '[]',
+    'dict': '{}',
+    'Dict': '{}',
+    'set': 'set()',
+    'Set': 'set()',
+    'tuple': '()',
+    'Tuple': '()',
+    'bytes': 'b""',
+    'bytearray': 'bytearray()',
+    'MemoryView': 'memoryview(b"")',
+    'None': 'None',
+    'Optional': 'None',
+    'Any': 'None'
+}
+
+# Empty values used by the edge-case tests for collection arguments
+_EMPTY_TEST_VALUES = {
+    'list': '[]',
+    'List': '[]',
+    'str': '""',
+    'dict': '{}',
+    'Dict': '{}',
+    'set': 'set()',
+    'Set': 'set()'
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _test_value_for_type(type_hint: str) -> str:
+    """Get a test value for a given type hint.
+    
+    Args:
+        type_hint: The type hint string.
+        
+    Returns:
+        A test value as a string.
+    """
+    # Plain type names resolve with a single lookup
+    test_value = _TYPE_TEST_VALUES.get(type_hint)
+    if test_value is not None:
+        return test_value
+    
+    # Only subscripted hints can contain these
+    if '[' in type_hint:
+        # Handle Optional types
+        if 'Optional[' in type_hint:
+            return 'None'
+        
+        # Handle List/Dict with generics
+        if 'List[' in type_hint:
+            return '[]'
+        if 'Dict[' in type_hint:
+            return '{}'
+    
+    return 'None'
+
+
+@functools.lru_cache(maxsize=1024)
+def _default_test_inputs(annotations: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Get the default test value for each argument of a signature.
+    
+    Signatures repeat heavily across a project (e.g. many (int, int)
+    functions), so each distinct annotation tuple is resolved once.
+    
+    Args:
+        annotations: Argument annotations, '' where there is none.
+        
+    Returns:
+        Test values as strings, one per argument.
+    """
+    return tuple(_test_value_for_type(annotation) for annotation in annotations)
+
+
+@functools.lru_cache(maxsize=1024)
+def _default_call_args(annotations: Tuple[str, ...]) -> str:
+    """Get the argument list of a call made with the default test inputs.
+    
+    Args:
+        annotations: Argument annotations, '' where there is none.
+        
+    Returns:
+        Comma-separated test values, ready to paste between parentheses.
+    """
+    return ', '.join(_default_test_inputs(annotations))
+
 
 class UnitTestGenerator:
     """Generates unit tests for Python functions and classes."""
@@ -12,258 +196,202 @@ class UnitTestGenerator:
     def __init__(self):
         self.test_count = 0
         
-    def generate(self, analysis: Dict[str, Any], output_path: Path) -> List[str]:
+    def generate(
+        self,
+        analysis: Dict[str, Any],
+        output_path: Path,
+        workers: Optional[int] = None
+    ) -> List[str]:
         """Generate unit tests based on analysis results.
         
+        Function and class tests go into a single module so pytest only
+        has one file to import and collect.
+        
         Args:
             analysis: Analysis results containing functions and classes.
             output_path: Path to output directory for test files.
+            workers: Number of worker processes. None renders tests in
+                parallel only for inputs above PARALLEL_THRESHOLD; 1 always
+                runs serially.
             
         Returns:
             List of generated test file paths.
         """
-        generated_files = []
-        
-        functions = analysis.get('functions', [])
-        classes = analysis.get('classes', [])
+        test_file = output_path / "test_generated.py"
         
-        # Generate tests for functions
-        if functions:
-            test_file = self._generate_function_tests(functions, output_path)
-            if test_file:
-                generated_files.append(test_file)
+        public_functions = []
+        for func in analysis.get('functions', []):
+            # Skip private functions
+            func_name = func.get('name', 'unknown')
+            if func_name.startswith('_') and not func_name.startswith('__'):
+                continue
+            public_functions.append(func)
         
-        # Generate tests for classes
-        if classes:
-            test_file = self._generate_class_tests(classes, output_path)
-            if test_file:
-                generated_files.append(test_file)
+        # Skip private classes
+        public_classes = [
+            cls for cls in analysis.get('classes', [])
+            if not cls.get('name', 'unknown').startswith('_')
+        ]
+        
+        # Nothing public to test, so don't write a header-only file
+        if not public_functions and not public_classes:
+            return []
+        
+        workers = resolve_workers(
+            workers, len(public_functions) + len(public_classes), PARALLEL_THRESHOLD
+        )
+        
+        with open(
+            test_file, 'w', encoding='utf-8', newline='\n', buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            f.write(_HEADER_UNIT)
+            
+            # Generate tests for functions
+            self._generate_function_tests(public_functions, f, workers)
+            
+            # Generate tests for classes
+            self._generate_class_tests(public_classes, f, workers)
         
-        return generated_files
+        return [str(test_file)]
     
-    def _generate_function_tests(self, functions: List[Dict], output_path: Path) -> str:
+    def _generate_function_tests(
+        self,
+        functions: List[Dict],
+        out: TextIO,
+        workers: int = 1
+    ) -> None:
         """Generate unit tests for functions.
         
         Args:
-            functions: List of function information.
-            output_path: Path to output directory.
-            
-        Returns:
-            Path to generated test file.
+            functions: List of public function information.
+            out: Stream to write the test code to.
+            workers: Number of worker processes; 1 or less writes directly.
         """
-        test_file = output_path / "test_functions.py"
-        
-        test_content = []
-        test_content.append('"""Unit tests for functions."""')
-        test_content.append('')
-        test_content.append('import pytest')
-        test_content.append('from unittest.mock import Mock, patch')
-        test_content.append('')
-        test_content.append('')
+        if workers > 1:
+            # Functions are independent, so workers render them to text and
+            # the chunks are written back in order
+            out.writelines(parallel_imap(
+                _render_function_tests, functions, workers, _RENDER_CHUNKSIZE
+            ))
+            return
         
         for func in functions:
-            test_content.extend(self._generate_function_test_cases(func))
-            test_content.append('')
-        
-        # Write test file
-        with open(test_file, 'w') as f:
-            f.write('\n'.join(test_content))
-        
-        return str(test_file)
+            self._generate_function_test_cases(func, out)
+            out.write('\n')
     
-    def _generate_function_test_cases(self, func: Dict) -> List[str]:
+    def _generate_function_test_cases(self, func: Dict, out: TextIO) -> None:
         """Generate test cases for a single function.
         
         Args:
             func: Function information dictionary.
-            
-        Returns:
-            List of test case code lines.
+            out: Stream to write the test code to.
         """
         func_name = func.get('name', 'unknown')
         args = func.get('args', [])
         
-        test_cases = []
-        
-        # Skip private functions
-        if func_name.startswith('_') and not func_name.startswith('__'):
-            return test_cases
-        
-        # Class for the function
-        test_cases.append(f'def test_{func_name}_basic():')
-        
         # Generate test code based on function signature
         if args:
-            # Create test inputs based on argument types
-            test_inputs = []
-            for arg in args:
-                arg_type = arg.get('annotation', '')
-                test_input = self._get_test_value_for_type(arg_type)
-                test_inputs.append(test_input)
-            
-            # Generate the function call
-            call_args = ', '.join(test_inputs)
-            test_cases.append(f'    # Test {func_name} with basic inputs')
-            test_cases.append(f'    result = {func_name}({call_args})')
-            test_cases.append(f'    assert result is not None  # Add your assertion')
+            # Create the call's test inputs based on argument types
+            call_args = _default_call_args(
+                tuple(arg.get('annotation', '') for arg in args)
+            )
+            out.write(_BASIC_TEST_TEMPLATE % {'name': func_name, 'args': call_args})
         else:
-            test_cases.append(f'    # Test {func_name} with no arguments')
-            test_cases.append(f'    result = {func_name}()')
-            test_cases.append(f'    assert result is not None  # Add your assertion')
-        
-        test_cases.append('')
+            out.write(_NO_ARGS_TEST_TEMPLATE % {'name': func_name})
         
         # Edge case tests
-        test_cases.extend(self._generate_edge_case_tests(func))
+        self._generate_edge_case_tests(func, out)
         
         # Error handling tests
-        test_cases.extend(self._generate_error_tests(func))
-        
-        return test_cases
+        self._generate_error_tests(func, out)
     
-    def _generate_edge_case_tests(self, func: Dict) -> List[str]:
+    def _generate_edge_case_tests(self, func: Dict, out: TextIO) -> None:
         """Generate edge case tests for a function.
         
         Args:
             func: Function information dictionary.
-            
-        Returns:
-            List of test case code lines.
+            out: Stream to write the test code to.
         """
         func_name = func.get('name', 'unknown')
         args = func.get('args', [])
         
-        test_cases = []
+        # Resolve every argument's default once; each test swaps in one value
+        annotations = tuple(arg.get('annotation', '') for arg in args)
+        defaults = _default_test_inputs(annotations)
         
         # Generate edge case tests for each argument
         for i, arg in enumerate(args):
-            arg_type = arg.get('annotation', '')
+            arg_type = annotations[i]
             arg_name = arg.get('name', f'arg{i}')
             
             # Test with None
-            test_cases.append(f'def test_{func_name}_{arg_name}_none():')
-            test_cases.append(f'    # Test with None value')
-            
-            test_inputs = []
-            for j, a in enumerate(args):
-                if j == i:
-                    test_inputs.append('None')
-                else:
-                    test_input = self._get_test_value_for_type(a.get('annotation', ''))
-                    test_inputs.append(test_input)
+            test_inputs = list(defaults)
+            test_inputs[i] = 'None'
             
-            call_args = ', '.join(test_inputs)
-            test_cases.append(f'    # result = {func_name}({call_args})')
-            test_cases.append(f'    # Add your assertion or expect error')
-            test_cases.append('')
+            out.write(_NONE_ARG_TEST_TEMPLATE % {
+                'name': func_name,
+                'arg': arg_name,
+                'args': ', '.join(test_inputs)
+            })
             
             # Test with empty values for collections
-            if arg_type in ['list', 'List', 'str', 'str', 'dict', 'Dict', 'set', 'Set']:
-                test_cases.append(f'def test_{func_name}_{arg_name}_empty():')
-                test_cases.append(f'    # Test with empty {arg_type}')
-                
-                test_inputs = []
-                for j, a in enumerate(args):
-                    if j == i:
-                        if arg_type in ['list', 'List']:
-                            test_inputs.append('[]')
-                        elif arg_type in ['str', 'str']:
-                            test_inputs.append('""')
-                        elif arg_type in ['dict', 'Dict']:
-                            test_inputs.append('{}')
-                        elif arg_type in ['set', 'Set']:
-                            test_inputs.append('set()')
-                        else:
-                            test_inputs.append(self._get_test_value_for_type(a.get('annotation', '')))
-                    else:
-                        test_input = self._get_test_value_for_type(a.get('annotation', ''))
-                        test_inputs.append(test_input)
+            empty_value = _EMPTY_TEST_VALUES.get(arg_type)
+            if empty_value is not None:
+                test_inputs[i] = empty_value
                 
-                call_args = ', '.join(test_inputs)
-                test_cases.append(f'    # result = {func_name}({call_args})')
-                test_cases.append(f'    # Add your assertion')
-                test_cases.append('')
-        
-        return test_cases
+                out.write(_EMPTY_ARG_TEST_TEMPLATE % {
+                    'name': func_name,
+                    'arg': arg_name,
+                    'type': arg_type,
+                    'args': ', '.join(test_inputs)
+                })
     
-    def _generate_error_tests(self, func: Dict) -> List[str]:
+    def _generate_error_tests(self, func: Dict, out: TextIO) -> None:
         """Generate error handling tests for a function.
         
         Args:
             func: Function information dictionary.
-            
-        Returns:
-            List of test case code lines.
+            out: Stream to write the test code to.
         """
         func_name = func.get('name', 'unknown')
         
-        test_cases = []
-        
         # Test that function raises appropriate exceptions
-        test_cases.append(f'def test_{func_name}_raises_on_invalid_input():')
-        test_cases.append(f'    # Test that function raises appropriate exceptions')
-        test_cases.append(f'    with pytest.raises((ValueError, TypeError)):')
-        test_cases.append(f'        {func_name}(invalid_input)')
-        test_cases.append('')
-        
-        return test_cases
+        out.write(_ERROR_TEST_TEMPLATE % {'name': func_name})
     
-    def _generate_class_tests(self, classes: List[Dict], output_path: Path) -> str:
+    def _generate_class_tests(
+        self,
+        classes: List[Dict],
+        out: TextIO,
+        workers: int = 1
+    ) -> None:
         """Generate unit tests for classes.
         
         Args:
-            classes: List of class information.
-            output_path: Path to output directory.
-            
-        Returns:
-            Path to generated test file.
+            classes: List of public class information.
+            out: Stream to write the test code to.
+            workers: Number of worker processes; 1 or less writes directly.
         """
-        test_file = output_path / "test_classes.py"
-        
-        test_content = []
-        test_content.append('"""Unit tests for classes."""')
-        test_content.append('')
-        test_content.append('import pytest')
-        test_content.append('from unittest.mock import Mock, patch, MagicMock')
-        test_content.append('')
+        if workers > 1:
+            out.writelines(parallel_imap(
+                _render_class_tests, classes, workers, _RENDER_CHUNKSIZE
+            ))
+            return
         
         for cls in classes:
-            test_content.extend(self._generate_class_test_cases(cls))
-            test_content.append('')
-        
-        # Write test file
-        with open(test_file, 'w') as f:
-            f.write('\n'.join(test_content))
-        
-        return str(test_file)
+            self._generate_class_test_cases(cls, out)
+            out.write('\n')
     
-    def _generate_class_test_cases(self, cls: Dict) -> List[str]:
+    def _generate_class_test_cases(self, cls: Dict, out: TextIO) -> None:
         """Generate test cases for a single class.
         
         Args:
             cls: Class information dictionary.
-            
-        Returns:
-            List of test case code lines.
+            out: Stream to write the test code to.
         """
         class_name = cls.get('name', 'unknown')
         
-        test_cases = []
-        
-        # Skip private classes
-        if class_name.startswith('_'):
-            return test_cases
-        
-        # Import statement
-        test_cases.append(f'# Tests for {class_name}')
-        test_cases.append('')
-        
-        # Test initialization
-        test_cases.append(f'def test_{class_name}_init():')
-        test_cases.append(f'    # Test class initialization')
-        test_cases.append(f'    # instance = {class_name}()')
-        test_cases.append(f'    # Add your assertions')
-        test_cases.append('')
+        # Section comment and initialization test
+        out.write(_CLASS_INIT_TEST_TEMPLATE % {'class_name': class_name})
         
         # Test methods
         methods = cls.get('methods', [])
@@ -274,103 +402,66 @@ class UnitTestGenerator:
             if method_name.startswith('_') and not method_name.startswith('__'):
                 continue
             
-            test_cases.extend(self._generate_method_tests(class_name, method))
-        
-        return test_cases
+            self._generate_method_tests(class_name, method, out)
     
-    def _generate_method_tests(self, class_name: str, method: Dict) -> List[str]:
+    def _generate_method_tests(self, class_name: str, method: Dict, out: TextIO) -> None:
         """Generate test cases for a class method.
         
         Args:
             class_name: Name of the class.
             method: Method information dictionary.
-            
-        Returns:
-            List of test case code lines.
+            out: Stream to write the test code to.
         """
         method_name = method.get('name', 'unknown')
         args = method.get('args', [])
         
-        test_cases = []
-        
         # Skip init
         if method_name == '__init__':
-            return test_cases
-        
-        # Test method
-        test_cases.append(f'def test_{class_name}_{method_name}():')
+            return
         
         # Skip self in args
-        test_args = args[1:] if args else []
-        
-        if test_args:
-            test_inputs = []
-            for arg in test_args:
-                arg_type = arg.get('annotation', '')
-                test_input = self._get_test_value_for_type(arg_type)
-                test_inputs.append(test_input)
-            
-            call_args = ', '.join(test_inputs)
-            
-            if method.get('is_static') or method.get('is_classmethod'):
-                test_cases.append(f'    # Test {method_name} method')
-                test_cases.append(f'    # result = {class_name}.{method_name}({call_args})')
-            else:
-                test_cases.append(f'    # Test {method_name} method')
-                test_cases.append(f'    # instance = {class_name}()')
-                test_cases.append(f'    # result = instance.{method_name}({call_args})')
-        else:
-            if method.get('is_static') or method.get('is_classmethod'):
-                test_cases.append(f'    # Test {method_name} method')
-                test_cases.append(f'    # result = {class_name}.{method_name}()')
-            else:
-                test_cases.append(f'    # Test {method_name} method')
-                test_cases.append(f'    # instance = {class_name}()')
-                test_cases.append(f'    # result = instance.{method_name}()')
-        
-        test_cases.append(f'    # Add your assertions')
-        test_cases.append('')
-        
-        return test_cases
-    
-    def _get_test_value_for_type(self, type_hint: str) -> str:
-        """Get a test value for a given type hint.
-        
-        Args:
-            type_hint: The type hint string.
-            
-        Returns:
-            A test value as a string.
-        """
-        type_mapping = {
-            'int': '1',
-            'float': '1.0',
-            'str': '"test"',
-            'bool': 'True',
-            'list': '[]',
-            'List': '[]',
-            'dict': '{}',
-            'Dict': '{}',
-            'set': 'set()',
-            'Set': 'set()',
-            'tuple': '()',
-            'Tuple': '()',
-            'bytes': 'b""',
-            'bytearray': 'bytearray()',
-            'MemoryView': 'memoryview(b"")',
-            'None': 'None',
-            'Optional': 'None',
-            'Any': 'None'
-        }
-        
-        # Handle Optional types
-        if 'Optional[' in type_hint:
-            return 'None'
+        call_args = _default_call_args(
+            tuple(arg.get('annotation', '') for arg in args[1:])
+        )
         
-        # Handle List/Dict with generics
-        if 'List[' in type_hint:
-            return '[]'
-        if 'Dict[' in type_hint:
-            return '{}'
+        # Static and class methods are called on the class itself
+        if method.get('is_static') or method.get('is_classmethod'):
+            template = _CLASS_METHOD_TEST_TEMPLATE
+        else:
+            template = _INSTANCE_METHOD_TEST_TEMPLATE
         
-        return type_mapping.get(type_hint, 'None')
+        out.write(template % {
+            'class_name': class_name,
+            'method_name': method_name,
+            'args': call_args
+        })
+
+
+def _render_function_tests(func: Dict) -> str:
+    """Render a function's unit tests in a worker process.
+    
+    Args:
+        func: Function information dictionary.
+        
+    Returns:
+        The test code, exactly as a serial run would write it.
+    """
+    out = io.StringIO()
+    UnitTestGenerator()._generate_function_test_cases(func, out)
+    out.write('\n')
+    return out.getvalue()
+
+
+def _render_class_tests(cls: Dict) -> str:
+    """Render a class's unit tests in a worker process.
+    
+    Args:
+        cls: Class information dictionary.
+        
+    Returns:
+        The test code, exactly as a serial run would write it.
+    """
+    out = io.StringIO()
+    UnitTestGenerator()._generate_class_test_cases(cls, out)
+    out.write('\n')
+    return out.getvalue()
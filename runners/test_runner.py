@@ -1,10 +1,128 @@
 """Test Runner - Executes generated tests and collects results."""
 
+import collections
+import contextlib
+import io
+import re
+import signal
 import subprocess
+import sys
 import json
+import os
+import tempfile
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# Counts in pytest's summary line, e.g. "2 failed, 5 passed, 1 error"
+_SUMMARY_RE = re.compile(r'(\d+) (passed|failed|errors?|skipped)\b')
+_SUMMARY_KEYS = {
+    'passed': 'passed',
+    'failed': 'failed',
+    'error': 'errors',
+    'errors': 'errors',
+    'skipped': 'skipped'
+}
+
+# Test name after the last "::" on FAILED/ERROR lines
+_FAILED_TEST_RE = re.compile(r'^.*(?:FAILED|ERROR).*::(.*)$', re.MULTILINE)
+
+# Time limits in seconds for a whole test run and for a single test file
+_RUN_TIMEOUT = 300
+_SINGLE_TEST_TIMEOUT = 60
+
+
+class _OutputTail(io.TextIOBase):
+    """Text stream that keeps only the last lines written to it."""
+    
+    def __init__(self, max_lines: int = 200):
+        self._lines = collections.deque(maxlen=max_lines)
+        self._partial = ""
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, text: str) -> int:
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        self._lines.extend(lines)
+        return len(text)
+    
+    def getvalue(self) -> str:
+        """Get the retained output."""
+        return "\n".join([*self._lines, self._partial])
+
+
+class _ResultCollector:
+    """pytest plugin that tallies test outcomes as they are reported."""
+    
+    def __init__(self):
+        self.counts = {"passed": 0, "failed": 0, "skipped": 0, "errors": 0}
+        self.failed_tests: List[str] = []
+        self.reported = False
+    
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        """Count one setup/call/teardown report of a test."""
+        self.reported = True
+        if report.passed:
+            if report.when == "call":
+                self.counts["passed"] += 1
+        elif report.skipped:
+            self.counts["skipped"] += 1
+        elif report.when == "call":
+            self.counts["failed"] += 1
+            self.failed_tests.append(report.nodeid.split("::")[-1])
+        else:
+            # Failures in setup or teardown are errors, as in pytest's summary
+            self.counts["errors"] += 1
+            self.failed_tests.append(report.nodeid.split("::")[-1])
+    
+    def pytest_collectreport(self, report: Any) -> None:
+        """Count test modules that failed to import as errors."""
+        self.reported = True
+        if report.failed:
+            self.counts["errors"] += 1
+            self.failed_tests.append(report.nodeid)
+
+
+class _SessionTimeout:
+    """Context manager that ends the running pytest session after a deadline.
+    
+    Uses SIGALRM, so the limit only applies in the main thread on POSIX
+    systems; elsewhere runs are not time-limited.
+    """
+    
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.expired = False
+        self._previous_handler: Any = None
+        self._armed = False
+    
+    def __enter__(self) -> "_SessionTimeout":
+        if (
+            self.seconds
+            and hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        ):
+            self._previous_handler = signal.signal(signal.SIGALRM, self._expire)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+            self._armed = True
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler)
+            self._armed = False
+    
+    def _expire(self, signum: int, frame: Any) -> None:
+        """Stop the session; outcomes reported so far are kept."""
+        import pytest
+        
+        self.expired = True
+        pytest.exit(f"timed out after {self.seconds} seconds")
 
 
 class TestRunner:
@@ -13,12 +131,13 @@ class TestRunner:
     def __init__(self):
         self.results: Dict[str, Any] = {}
         
-    def run(self, test_dir: Path, test_files: List[str]) -> Dict[str, Any]:
+    def run(self, test_dir: Path, test_files: List[str], verbose: bool = False) -> Dict[str, Any]:
         """Run all generated tests.
         
         Args:
             test_dir: Directory containing test files.
             test_files: List of test file paths.
+            verbose: Have pytest print one line per test and short tracebacks.
             
         Returns:
             Dictionary containing test results.
@@ -42,14 +161,7 @@ class TestRunner:
         
         # Run pytest on all test files
         try:
-            result = self._run_pytest(test_dir)
-            
-            # Parse results
-            if result.returncode == 0:
-                results["passed"] = len(test_files)
-                results["total"] = len(test_files)
-            else:
-                results = self._parse_pytest_output(result.stdout, results)
+            results = self._run_pytest(test_dir, results, verbose)
                 
         except Exception as e:
             print(f"  ❌ Error running tests: {e}")
@@ -61,33 +173,139 @@ class TestRunner:
         self.results = results
         return results
     
-    def _run_pytest(self, test_dir: Path) -> subprocess.CompletedProcess:
+    def _run_pytest(
+        self,
+        test_dir: Path,
+        results: Dict[str, Any],
+        verbose: bool = False
+    ) -> Dict[str, Any]:
         """Run pytest on test directory.
         
         Args:
             test_dir: Directory containing test files.
+            results: Results dictionary to update.
+            verbose: Have pytest print one line per test and short tracebacks.
             
         Returns:
-            CompletedProcess instance.
+            Updated results dictionary.
         """
-        # Run pytest with verbose output
-        cmd = [
-            "python", "-m", "pytest",
+        # Results come from report hooks, so pytest's own output is kept
+        # minimal unless asked for; skip writing .pytest_cache as well
+        args = [
             str(test_dir),
-            "-v",
-            "--tb=short",
             "--no-header",
-            "-q"
+            "-p", "no:cacheprovider"
         ]
+        if verbose:
+            args.extend(["-v", "--tb=short"])
+        else:
+            args.extend(["-q", "--tb=line"])
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        return self._collect_results(args, results, [test_dir], timeout=_RUN_TIMEOUT)
+    
+    def _collect_results(
+        self,
+        args: List[str],
+        results: Dict[str, Any],
+        code_roots: Sequence[Path],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run pytest and record the outcomes it reports through its hooks.
         
-        return result
+        Args:
+            args: Command line arguments for pytest.
+            results: Results dictionary to update.
+            code_roots: Directories holding the tests and the code they import.
+            timeout: Seconds after which the run is stopped, or None.
+            
+        Returns:
+            Updated results dictionary.
+            
+        Raises:
+            TimeoutError: If the run did not finish within the timeout.
+        """
+        collector = _ResultCollector()
+        result = self._pytest_main(args, code_roots, plugins=[collector], timeout=timeout)
+        
+        # pytest stopped before reporting anything (e.g. a usage error)
+        if not collector.reported:
+            return self._parse_pytest_output(result.stdout, results)
+        
+        results.update(collector.counts)
+        results["total"] = sum(collector.counts.values())
+        if collector.failed_tests:
+            # A test failing in both call and teardown is reported twice
+            results["failed_tests"] = sorted(
+                {*results.get("failed_tests", []), *collector.failed_tests}
+            )
+        
+        return results
+    
+    def _pytest_main(
+        self,
+        args: List[str],
+        code_roots: Sequence[Path],
+        plugins: Optional[List[Any]] = None,
+        timeout: Optional[float] = None
+    ) -> subprocess.CompletedProcess:
+        """Run pytest in this process and capture the tail of its output.
+        
+        Avoids starting a new interpreter and re-importing pytest for every
+        run, so repeated calls (e.g. run_single_test per test) only pay for
+        collecting and running the tests. Modules imported by the run from
+        the code roots are dropped afterwards, and sys.path is restored, so
+        the next run sees edited test files. Results
+        come from plugin hooks, so only the last lines of the terminal
+        output (where the summary is) are kept rather than buffering all
+        of it. The result mimics subprocess.run so callers can treat it
+        the same way.
+        
+        Args:
+            args: Command line arguments for pytest.
+            code_roots: Directories holding the tests and the code they
+                import; modules loaded from them are forgotten after the run.
+            plugins: Plugin objects to register for this run.
+            timeout: Seconds after which the session is stopped, or None.
+            
+        Returns:
+            CompletedProcess with pytest's exit code and the end of its output.
+            
+        Raises:
+            TimeoutError: If the run did not finish within the timeout.
+        """
+        # Imported lazily so test generation works without pytest installed
+        import pytest
+        
+        root_prefixes = tuple(os.path.join(os.path.realpath(root), '') for root in code_roots)
+        loaded_modules = set(sys.modules)
+        saved_path = list(sys.path)
+        output = _OutputTail()
+        deadline = _SessionTimeout(timeout)
+        try:
+            with contextlib.redirect_stdout(output), deadline:
+                returncode = pytest.main(args, plugins=plugins)
+        except pytest.exit.Exception:
+            # The deadline can also fire outside pytest's own handling
+            if not deadline.expired:
+                raise
+        finally:
+            # Forget the test modules (and the project code they imported)
+            # so a rerun re-imports them instead of reusing cached versions;
+            # everything else, such as pytest plugins, stays loaded
+            for name in set(sys.modules) - loaded_modules:
+                module_file = getattr(sys.modules.get(name), "__file__", None)
+                if module_file and os.path.realpath(module_file).startswith(root_prefixes):
+                    del sys.modules[name]
+            
+            # Drop the rootdir/conftest entries pytest inserted
+            sys.path[:] = saved_path
+        
+        if deadline.expired:
+            raise TimeoutError(f"Test run timed out after {timeout} seconds")
+        
+        return subprocess.CompletedProcess(
+            ["pytest", *args], int(returncode), stdout=output.getvalue(), stderr=""
+        )
     
     def _parse_pytest_output(self, output: str, results: Dict[str, Any]) -> Dict[str, Any]:
         """Parse pytest output to extract test results.
@@ -99,58 +317,18 @@ class TestRunner:
         Returns:
             Updated results dictionary.
         """
-        lines = output.split('\n')
-        
-        # Look for pytest summary line
-        for line in lines:
-            if 'passed' in line or 'failed' in line or 'error' in line:
-                # Parse summary like "5 passed, 2 failed"
-                if 'passed' in line:
-                    parts = line.split()
-                    for i, part in enumerate(parts):
-                        if part == 'passed':
-                            try:
-                                results["passed"] = int(parts[i-1])
-                            except (ValueError, IndexError):
-                                pass
-                
-                if 'failed' in line:
-                    parts = line.split()
-                    for i, part in enumerate(parts):
-                        if part == 'failed':
-                            try:
-                                results["failed"] = int(parts[i-1])
-                            except (ValueError, IndexError):
-                                pass
-                            
-                if 'error' in line:
-                    parts = line.split()
-                    for i, part in enumerate(parts):
-                        if part == 'error':
-                            try:
-                                results["errors"] = int(parts[i-1])
-                            except (ValueError, IndexError):
-                                pass
-                            
-                if 'skipped' in line:
-                    parts = line.split()
-                    for i, part in enumerate(parts):
-                        if part == 'skipped':
-                            try:
-                                results["skipped"] = int(parts[i-1])
-                            except (ValueError, IndexError):
-                                pass
+        # Parse summary like "5 passed, 2 failed"; the last one wins
+        for match in _SUMMARY_RE.finditer(output):
+            results[_SUMMARY_KEYS[match.group(2)]] = int(match.group(1))
         
         # Calculate total
         results["total"] = results["passed"] + results["failed"] + results["errors"] + results["skipped"]
         
-        # Extract failed test names
-        for line in lines:
-            if 'FAILED' in line or 'ERROR' in line:
-                # Extract test name
-                if '::' in line:
-                    test_name = line.split('::')[-1].strip()
-                    results["failed_tests"].append(test_name)
+        # Extract failed test names, once each
+        failed = set(results.get("failed_tests", ()))
+        for match in _FAILED_TEST_RE.finditer(output):
+            failed.add(match.group(1).strip())
+        results["failed_tests"] = sorted(failed)
         
         return results
     
@@ -173,26 +351,21 @@ class TestRunner:
             "failed_tests": []
         }
         
-        cmd = [
-            "python", "-m", "pytest",
+        args = [
             str(test_file),
-            "-v"
+            "-q",
+            "-p", "no:cacheprovider"
         ]
         
         if test_name:
-            cmd.extend(["-k", test_name])
+            args.extend(["-k", test_name])
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
+            results = self._collect_results(
+                args, results, [Path(test_file).parent], timeout=_SINGLE_TEST_TIMEOUT
             )
             
-            results = self._parse_pytest_output(result.stdout, results)
-            
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             results["errors"] = 1
             results["failed_tests"].append("Test timed out")
         except Exception as e:
@@ -221,29 +394,26 @@ class TestRunner:
             "coverage": {}
         }
         
-        cmd = [
-            "python", "-m", "pytest",
-            str(test_dir),
-            "--cov", str(source_dir),
-            "--cov-report", "json",
-            "-v"
-        ]
-        
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            results = self._parse_pytest_output(result.stdout, results)
-            
-            # Try to read coverage data
-            coverage_file = Path("coverage.json")
-            if coverage_file.exists():
-                with open(coverage_file, 'r') as f:
-                    coverage_data = json.load(f)
+            # Write the report to a known path instead of the working
+            # directory, which is cleaned up along with it
+            with tempfile.TemporaryDirectory() as report_dir:
+                coverage_file = Path(report_dir) / "coverage.json"
+                args = [
+                    str(test_dir),
+                    "--cov", str(source_dir),
+                    "--cov-report", f"json:{coverage_file}",
+                    "-q",
+                    "-p", "no:cacheprovider"
+                ]
+                
+                results = self._collect_results(
+                    args, results, [test_dir, source_dir], timeout=_RUN_TIMEOUT
+                )
+                
+                # Try to read coverage data
+                if coverage_file.exists():
+                    coverage_data = json.loads(coverage_file.read_bytes())
                     results["coverage"] = coverage_data.get("totals", {})
                     
         except Exception as e:
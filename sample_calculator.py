@@ -1,5 +1,7 @@
 """Sample Calculator Module - For testing the Smart Test Generator."""
 
+import base64
+
 
 def add(a: int, b: int) -> int:
     """Add two numbers.
@@ -70,10 +72,13 @@ def process_data(data: list) -> dict:
     if not data:
         return {"sum": 0, "average": 0, "count": 0}
     
+    total = sum(data)
+    count = len(data)
+    
     return {
-        "sum": sum(data),
-        "average": sum(data) / len(data),
-        "count": len(data),
+        "sum": total,
+        "average": total / count,
+        "count": count,
         "min": min(data),
         "max": max(data)
     }
@@ -150,7 +155,6 @@ def encode_data(data: str) -> str:
     Returns:
         Encoded string
     """
-    import base64
     return base64.b64encode(data.encode()).decode()
 
 
@@ -163,5 +167,4 @@ def decode_data(data: str) -> str:
     Returns:
         Decoded string
     """
-    import base64
     return base64.b64decode(data.encode()).decode()
@@ -8,10 +8,11 @@ by understanding code behavior, edge cases, and common failure modes.
 
 import argparse
 import ast
+import functools
 import os
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import json
 from datetime import datetime
 
@@ -23,20 +24,63 @@ from generators.integration_generator import IntegrationTestGenerator
 from generators.property_generator import PropertyBasedTestGenerator
 from runners.test_runner import TestRunner
 from utils.code_parser import CodeParser
+from utils.fs_walk import iter_python_files
+from utils.parallel import parallel_imap, resolve_workers
 from utils.report_generator import ReportGenerator
 
 
+# In automatic mode, source files are analyzed by worker processes only for
+# projects with more than this many files.
+PARALLEL_THRESHOLD = 200
+
+
+@functools.lru_cache(maxsize=None)
+def _file_analyzer(cache_dir: Optional[Path]) -> ASTAnalyzer:
+    """Get this process's analyzer for a cache directory."""
+    return ASTAnalyzer(cache_dir=cache_dir)
+
+
+def _analyze_file(job: Tuple[Path, Optional[Path]]) -> Dict[str, Any]:
+    """Read and analyze a single source file.
+    
+    Args:
+        job: Tuple of (source file path, analysis cache directory or None).
+        
+    Returns:
+        The file's analysis, or a dictionary with an 'error' message if the
+        file could not be read or parsed.
+    """
+    file_path, cache_dir = job
+    try:
+        # The parser decodes the raw bytes itself, so skip text-mode decoding
+        source_code = Path(file_path).read_bytes()
+        
+        # Parse and analyze functions and classes (memoized per source)
+        return _file_analyzer(cache_dir).analyze_source(source_code)
+    
+    except Exception as e:
+        return {"error": str(e)}
+
+
 class SmartTestGenerator:
     """Main class for the Smart Test Generator."""
     
-    def __init__(self, source_path: str, output_path: str, test_type: str = "all"):
+    def __init__(
+        self,
+        source_path: str,
+        output_path: str,
+        test_type: str = "all",
+        cache_dir: Optional[str] = None,
+        verbose: bool = False
+    ):
         self.source_path = Path(source_path)
         self.output_path = Path(output_path)
         self.test_type = test_type
+        self.verbose = verbose
         
         # Initialize components
         self.code_parser = CodeParser()
-        self.ast_analyzer = ASTAnalyzer()
+        self.ast_analyzer = ASTAnalyzer(cache_dir=cache_dir)
         self.edge_detector = EdgeCaseDetector()
         self.failure_detector = FailureModeDetector()
         
@@ -51,14 +95,21 @@ class SmartTestGenerator:
         self.analysis_results: Dict[str, Any] = {}
         self.generated_tests: List[str] = []
         
-    def analyze_code(self) -> Dict[str, Any]:
-        """Analyze source code to understand its structure and behavior."""
+    def analyze_code(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """Analyze source code to understand its structure and behavior.
+        
+        Args:
+            workers: Number of worker processes. None analyzes files in
+                parallel only for projects above PARALLEL_THRESHOLD files;
+                1 always runs serially.
+        """
         print(f"🔍 Analyzing code in: {self.source_path}")
         
         if self.source_path.is_file():
             files = [self.source_path]
         else:
-            files = list(self.source_path.rglob("*.py"))
+            # Sorted so the analysis does not depend on directory order
+            files = sorted(Path(path) for path in iter_python_files(self.source_path))
         
         analysis_results = {
             "files": [],
@@ -70,20 +121,21 @@ class SmartTestGenerator:
             "failure_modes": []
         }
         
-        for file_path in files:
+        # Files are independent, so large projects are analyzed in parallel
+        workers = resolve_workers(workers, len(files), PARALLEL_THRESHOLD)
+        # Workers build their own analyzers, so they only need the cache dir
+        jobs = [(file_path, self.ast_analyzer.cache_dir) for file_path in files]
+        
+        # Results stream in input order, so progress prints as files finish
+        for file_path, source_analysis in zip(files, parallel_imap(_analyze_file, jobs, workers)):
             print(f"  📄 Analyzing: {file_path}")
             
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    source_code = f.read()
-                
-                # Parse AST
-                tree = self.code_parser.parse(source_code)
+                if "error" in source_analysis:
+                    raise ValueError(source_analysis["error"])
                 
-                # Analyze functions and classes
-                functions = self.ast_analyzer.extract_functions(tree)
-                classes = self.ast_analyzer.extract_classes(tree)
-                imports = self.ast_analyzer.extract_imports(tree)
+                functions = source_analysis["functions"]
+                classes = source_analysis["classes"]
                 
                 # Detect edge cases
                 edge_cases = self.edge_detector.detect(functions, classes)
@@ -94,7 +146,7 @@ class SmartTestGenerator:
                 analysis_results["files"].append(str(file_path))
                 analysis_results["functions"].extend(functions)
                 analysis_results["classes"].extend(classes)
-                analysis_results["imports"].extend(imports)
+                analysis_results["imports"].extend(source_analysis["imports"])
                 analysis_results["edge_cases"].extend(edge_cases)
                 analysis_results["failure_modes"].extend(failure_modes)
                 
@@ -151,7 +203,8 @@ class SmartTestGenerator:
         
         results = self.test_runner.run(
             self.output_path,
-            self.generated_tests
+            self.generated_tests,
+            verbose=self.verbose
         )
         
         return results
@@ -239,6 +292,13 @@ def main():
         help="Run generated tests after generation"
     )
     
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory for the on-disk analysis cache (disabled if omitted)"
+    )
+    
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -259,7 +319,9 @@ def main():
     generator = SmartTestGenerator(
         source_path=args.source,
         output_path=args.output,
-        test_type=args.test_type
+        test_type=args.test_type,
+        cache_dir=args.cache_dir,
+        verbose=args.verbose
     )
     
     # Run pipeline
@@ -3,9 +3,17 @@
 import ast
 import tokenize
 import io
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
+# Node types of (async) function definitions, matched by exact type
+_FUNCTION_TYPES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef))
+
+# Process-wide token lists keyed by source text (most recent last).
+_TOKEN_CACHE: "OrderedDict[str, List[tokenize.TokenInfo]]" = OrderedDict()
+_TOKEN_CACHE_SIZE = 64
+
 
 class CodeParser:
     """Utility class for parsing source code into AST and extracting information."""
@@ -14,6 +22,11 @@ class CodeParser:
         self.source_code: str = ""
         self.tree: Optional[ast.AST] = None
         self.tokens: List[tokenize.TokenInfo] = []
+        self._source_lines: Optional[List[str]] = None
+        self._names_tree: Optional[ast.AST] = None
+        self._names: Dict[str, list] = {}
+        self._decorator_cache: Dict[ast.AST, frozenset] = {}
+        self._unparse_cache: Dict[ast.AST, str] = {}
         
     def parse(self, source_code: str) -> ast.AST:
         """Parse source code into an AST.
@@ -28,6 +41,10 @@ class CodeParser:
             SyntaxError: If the source code has syntax errors.
         """
         self.source_code = source_code
+        self.tokens = []
+        self._source_lines = None
+        self._decorator_cache.clear()
+        self._unparse_cache.clear()
         try:
             self.tree = ast.parse(source_code)
             return self.tree
@@ -50,6 +67,10 @@ class CodeParser:
     def get_tokens(self) -> List[tokenize.TokenInfo]:
         """Get all tokens from the source code.
         
+        Token lists are memoized per source text for the whole process, so
+        re-analyzing an unchanged file does not tokenize it again. The
+        returned list is shared and must not be mutated.
+        
         Returns:
             List of tokens.
         """
@@ -57,12 +78,63 @@ class CodeParser:
             return []
         
         if not self.tokens:
-            self.tokens = list(tokenize.generate_tokens(
-                io.StringIO(self.source_code).readline
-            ))
+            tokens = _TOKEN_CACHE.get(self.source_code)
+            if tokens is None:
+                tokens = list(tokenize.generate_tokens(
+                    io.StringIO(self.source_code).readline
+                ))
+                _TOKEN_CACHE[self.source_code] = tokens
+                if len(_TOKEN_CACHE) > _TOKEN_CACHE_SIZE:
+                    _TOKEN_CACHE.popitem(last=False)
+            else:
+                _TOKEN_CACHE.move_to_end(self.source_code)
+            self.tokens = tokens
         
         return self.tokens
     
+    def _collect_names(self) -> Dict[str, list]:
+        """Collect function names, class names and imports in one walk.
+        
+        Nodes are visited in ``ast.walk`` order, so each list matches what a
+        separate walk per kind would produce. Results are cached for the
+        most recently walked tree.
+        
+        Returns:
+            Dictionary with 'functions', 'classes' and 'imports' lists.
+        """
+        if self._names_tree is self.tree:
+            return self._names
+        
+        functions = []
+        classes = []
+        imports = []
+        
+        for node in ast.walk(self.tree):
+            node_type = type(node)
+            if node_type in _FUNCTION_TYPES:
+                functions.append(node.name)
+            elif node_type is ast.ClassDef:
+                classes.append(node.name)
+            elif node_type is ast.Import:
+                for alias in node.names:
+                    imports.append({
+                        "module": alias.name,
+                        "name": alias.asname or alias.name,
+                        "type": "import"
+                    })
+            elif node_type is ast.ImportFrom:
+                module = node.module or ""
+                for alias in node.names:
+                    imports.append({
+                        "module": f"{module}.{alias.name}" if module else alias.name,
+                        "name": alias.asname or alias.name,
+                        "type": "from_import"
+                    })
+        
+        self._names_tree = self.tree
+        self._names = {"functions": functions, "classes": classes, "imports": imports}
+        return self._names
+    
     def get_function_names(self) -> List[str]:
         """Get all function names in the source code.
         
@@ -72,14 +144,7 @@ class CodeParser:
         if not self.tree:
             return []
         
-        functions = []
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append(node.name)
-            elif isinstance(node, ast.AsyncFunctionDef):
-                functions.append(node.name)
-        
-        return functions
+        return list(self._collect_names()["functions"])
     
     def get_class_names(self) -> List[str]:
         """Get all class names in the source code.
@@ -90,12 +155,7 @@ class CodeParser:
         if not self.tree:
             return []
         
-        classes = []
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.ClassDef):
-                classes.append(node.name)
-        
-        return classes
+        return list(self._collect_names()["classes"])
     
     def get_imports(self) -> List[Dict[str, str]]:
         """Get all imports in the source code.
@@ -106,26 +166,7 @@ class CodeParser:
         if not self.tree:
             return []
         
-        imports = []
-        
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append({
-                        "module": alias.name,
-                        "name": alias.asname or alias.name,
-                        "type": "import"
-                    })
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                for alias in node.names:
-                    imports.append({
-                        "module": f"{module}.{alias.name}" if module else alias.name,
-                        "name": alias.asname or alias.name,
-                        "type": "from_import"
-                    })
-        
-        return imports
+        return [dict(imp) for imp in self._collect_names()["imports"]]
     
     def get_docstring(self, node: ast.AST) -> Optional[str]:
         """Get the docstring from an AST node.
@@ -158,12 +199,13 @@ class CodeParser:
                 "default": None  # Will be filled below
             })
         
-        # Add defaults (mapped from right to left)
+        # Add defaults (mapped from right to left). Positional-only
+        # parameters share args.defaults, so there can be more defaults
+        # than arguments here; the extra leading ones are skipped.
         defaults = args.defaults
-        for i, default in enumerate(defaults):
-            arg_index = len(arguments) - len(defaults) + i
-            if arg_index >= 0:
-                arguments[arg_index]["default"] = self._ast_to_str(default)
+        offset = len(arguments) - len(defaults)
+        for argument, default in zip(arguments[max(offset, 0):], defaults[max(-offset, 0):]):
+            argument["default"] = self._ast_to_str(default)
         
         # Handle *args and **kwargs
         vararg = None
@@ -189,7 +231,7 @@ class CodeParser:
             "vararg": vararg,
             "kwarg": kwarg,
             "returns": returns,
-            "is_async": isinstance(node, ast.AsyncFunctionDef)
+            "is_async": type(node) is ast.AsyncFunctionDef
         }
     
     def get_class_methods(self, node: ast.ClassDef) -> List[Dict[str, Any]]:
@@ -204,23 +246,11 @@ class CodeParser:
         methods = []
         
         for item in node.body:
-            if isinstance(item, ast.FunctionDef):
+            if type(item) in _FUNCTION_TYPES:
                 methods.append({
                     "name": item.name,
                     "signature": self.get_function_signature(item),
-                    "is_static": any(
-                        isinstance(d, ast.StaticMethod) 
-                        for d in node.decorator_list
-                        if hasattr(d, 'attr') and d.attr == item.name
-                    ) or self._has_decorator(item, 'staticmethod'),
-                    "is_classmethod": self._has_decorator(item, 'classmethod'),
-                    "docstring": self.get_docstring(item)
-                })
-            elif isinstance(item, ast.AsyncFunctionDef):
-                methods.append({
-                    "name": item.name,
-                    "signature": self.get_function_signature(item),
-                    "is_static": False,
+                    "is_static": self._has_decorator(item, 'staticmethod'),
                     "is_classmethod": self._has_decorator(item, 'classmethod'),
                     "docstring": self.get_docstring(item)
                 })
@@ -234,22 +264,42 @@ class CodeParser:
         return self._ast_to_str(node)
     
     def _ast_to_str(self, node: ast.AST) -> str:
-        """Convert an AST node to its string representation."""
-        return ast.unparse(node)
+        """Convert an AST node to its string representation.
+        
+        Plain names (the most common annotation) are returned directly, and
+        other nodes are unparsed once and cached until the next parse.
+        """
+        if type(node) is ast.Name:
+            return node.id
+        
+        source = self._unparse_cache.get(node)
+        if source is None:
+            source = ast.unparse(node)
+            self._unparse_cache[node] = source
+        return source
+    
+    def _decorator_names(self, node: ast.FunctionDef) -> frozenset:
+        """Get the names of a function's decorators, cached per node.
+        
+        A decorator's name is its last dotted component, and a call such as
+        ``@lru_cache(maxsize=None)`` is named after the callable.
+        """
+        names = self._decorator_cache.get(node)
+        if names is None:
+            found = set()
+            for decorator in node.decorator_list:
+                if isinstance(decorator, ast.Call):
+                    decorator = decorator.func
+                if isinstance(decorator, ast.Name):
+                    found.add(decorator.id)
+                elif isinstance(decorator, ast.Attribute):
+                    found.add(decorator.attr)
+            names = self._decorator_cache[node] = frozenset(found)
+        return names
     
     def _has_decorator(self, node: ast.FunctionDef, decorator_name: str) -> bool:
         """Check if a function has a specific decorator."""
-        for decorator in node.decorator_list:
-            if isinstance(decorator, ast.Name) and decorator.id == decorator_name:
-                return True
-            if isinstance(decorator, ast.Attribute) and decorator.attr == decorator_name:
-                return True
-            if isinstance(decorator, ast.Call):
-                if isinstance(decorator.func, ast.Name) and decorator.func.id == decorator_name:
-                    return True
-                if isinstance(decorator.func, ast.Attribute) and decorator.func.attr == decorator_name:
-                    return True
-        return False
+        return decorator_name in self._decorator_names(node)
     
     def get_source_lines(self, node: ast.AST) -> Tuple[int, int]:
         """Get the start and end line numbers for an AST node.
@@ -272,5 +322,8 @@ class CodeParser:
             The source code of the function body.
         """
         start, end = self.get_source_lines(node)
-        lines = self.source_code.split('\n')
-        return '\n'.join(lines[start-1:end])
+        
+        # Split the source once per parse rather than once per function
+        if self._source_lines is None:
+            self._source_lines = self.source_code.split('\n')
+        return '\n'.join(self._source_lines[start-1:end])
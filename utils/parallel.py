@@ -0,0 +1,97 @@
+"""Parallel Helpers - Spread independent work across worker processes."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def resolve_workers(workers: Optional[int], item_count: int, threshold: int) -> int:
+    """Decide how many worker processes to use.
+    
+    Args:
+        workers: Requested number of workers, or None for automatic mode.
+        item_count: Number of items to process.
+        threshold: In automatic mode, item count above which to go parallel.
+        
+    Returns:
+        Number of workers; 1 means run in the current process.
+    """
+    if workers is None:
+        if item_count <= threshold:
+            return 1
+        return os.cpu_count() or 1
+    return max(workers, 1)
+
+
+def parallel_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    chunksize: int = 64
+) -> List[R]:
+    """Apply a function to every item, preserving input order.
+    
+    Args:
+        func: Picklable callable applied to each item.
+        items: Items to process.
+        workers: Number of worker processes; 1 or less runs serially.
+        chunksize: Number of items sent to a worker at a time.
+        
+    Returns:
+        List of results in the same order as the items.
+    """
+    return list(parallel_imap(func, items, workers, chunksize))
+
+
+def parallel_imap(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    chunksize: int = 64
+) -> Iterator[R]:
+    """Apply a function to every item, yielding results in input order.
+    
+    Unlike parallel_map, each result is yielded as soon as it and every
+    result before it are ready, so callers can report progress.
+    
+    Args:
+        func: Picklable callable applied to each item.
+        items: Items to process.
+        workers: Number of worker processes; 1 or less runs serially.
+        chunksize: Number of items sent to a worker at a time.
+        
+    Yields:
+        Results in the same order as the items.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) < 2:
+        for item in items:
+            yield func(item)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, items, chunksize=chunksize)
+
+
+def parallel_calls(
+    calls: Sequence[Tuple[Callable[..., R], Tuple[Any, ...]]],
+    workers: int
+) -> List[R]:
+    """Run independent calls, each in its own task, preserving call order.
+    
+    Args:
+        calls: Pairs of picklable callable and positional arguments.
+        workers: Number of worker processes; 1 or less runs serially.
+        
+    Returns:
+        List of return values in the same order as the calls.
+    """
+    if workers <= 1 or len(calls) < 2:
+        return [func(*args) for func, args in calls]
+    
+    with ProcessPoolExecutor(max_workers=min(workers, len(calls))) as executor:
+        futures = [executor.submit(func, *args) for func, args in calls]
+        return [future.result() for future in futures]
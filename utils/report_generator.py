@@ -1,11 +1,167 @@
 """Report Generator - Generate detailed reports for test generation."""
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 from datetime import datetime
 from pathlib import Path
 
 
+# Reports are streamed to disk through a buffer of this many bytes
+_WRITE_BUFFER_SIZE = 1 << 16
+
+# Static start of the HTML report, up to the opening <body> tag
+_HTML_HEAD = (
+    '<!DOCTYPE html>\n'
+    '<html lang="en">\n'
+    '<head>\n'
+    '    <meta charset="UTF-8">\n'
+    '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+    '    <title>Smart Test Generator Report</title>\n'
+    '    <style>\n'
+    '        body {\n'
+    "            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;\n"
+    '            max-width: 1200px;\n'
+    '            margin: 0 auto;\n'
+    '            padding: 20px;\n'
+    '            background: #f5f5f5;\n'
+    '        }\n'
+    '        .header {\n'
+    '            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);\n'
+    '            color: white;\n'
+    '            padding: 30px;\n'
+    '            border-radius: 10px;\n'
+    '            margin-bottom: 20px;\n'
+    '        }\n'
+    '        .section {\n'
+    '            background: white;\n'
+    '            padding: 20px;\n'
+    '            border-radius: 10px;\n'
+    '            margin-bottom: 20px;\n'
+    '            box-shadow: 0 2px 4px rgba(0,0,0,0.1);\n'
+    '        }\n'
+    '        .stat {\n'
+    '            display: inline-block;\n'
+    '            background: #e8f4f8;\n'
+    '            padding: 15px 25px;\n'
+    '            border-radius: 8px;\n'
+    '            margin: 10px 10px 10px 0;\n'
+    '        }\n'
+    '        .stat-value {\n'
+    '            font-size: 24px;\n'
+    '            font-weight: bold;\n'
+    '            color: #667eea;\n'
+    '        }\n'
+    '        .stat-label {\n'
+    '            color: #666;\n'
+    '            font-size: 14px;\n'
+    '        }\n'
+    '        .test-pass {\n'
+    '            color: #10b981;\n'
+    '        }\n'
+    '        .test-fail {\n'
+    '            color: #ef4444;\n'
+    '        }\n'
+    '        ul {\n'
+    '            list-style-type: none;\n'
+    '            padding-left: 0;\n'
+    '        }\n'
+    '        li {\n'
+    '            padding: 8px 0;\n'
+    '            border-bottom: 1px solid #eee;\n'
+    '        }\n'
+    '    </style>\n'
+    '</head>\n'
+    '<body>\n'
+)
+
+# Report sections, filled in with %-formatting on a mapping.
+_HTML_SUMMARY_TEMPLATE = (
+    '    <div class="header">\n'
+    '        <h1>🚀 Smart Test Generator Report</h1>\n'
+    '        <p>Generated: %(timestamp)s</p>\n'
+    '    </div>\n'
+    '    \n'
+    '    <div class="section">\n'
+    '        <h2>📊 Analysis Summary</h2>\n'
+    '        <div class="stat">\n'
+    '            <div class="stat-value">%(file_count)s</div>\n'
+    '            <div class="stat-label">Files Analyzed</div>\n'
+    '        </div>\n'
+    '        <div class="stat">\n'
+    '            <div class="stat-value">%(function_count)s</div>\n'
+    '            <div class="stat-label">Functions</div>\n'
+    '        </div>\n'
+    '        <div class="stat">\n'
+    '            <div class="stat-value">%(class_count)s</div>\n'
+    '            <div class="stat-label">Classes</div>\n'
+    '        </div>\n'
+    '        <div class="stat">\n'
+    '            <div class="stat-value">%(edge_case_count)s</div>\n'
+    '            <div class="stat-label">Edge Cases</div>\n'
+    '        </div>\n'
+    '        <div class="stat">\n'
+    '            <div class="stat-value">%(failure_mode_count)s</div>\n'
+    '            <div class="stat-label">Failure Modes</div>\n'
+    '        </div>\n'
+    '    </div>\n'
+    '    \n'
+    '    <div class="section">\n'
+    '        <h2>📝 Generated Tests</h2>\n'
+    '        <p>Total: %(test_count)s tests</p>\n'
+    '        <ul>\n'
+)
+
+_HTML_TEST_ITEM_TEMPLATE = '            <li>📄 %s</li>\n'
+
+_HTML_TESTS_END = (
+    '        </ul>\n'
+    '    </div>\n'
+)
+
+_HTML_RESULTS_TEMPLATE = (
+    '    <div class="section">\n'
+    '        <h2>🧪 Test Results</h2>\n'
+    '        <div class="stat">\n'
+    '            <div class="stat-value test-pass">%(passed)s</div>\n'
+    '            <div class="stat-label">Passed</div>\n'
+    '        </div>\n'
+    '        <div class="stat">\n'
+    '            <div class="stat-value test-fail">%(failed)s</div>\n'
+    '            <div class="stat-label">Failed</div>\n'
+    '        </div>\n'
+    '        <div class="stat">\n'
+    '            <div class="stat-value">%(skipped)s</div>\n'
+    '            <div class="stat-label">Skipped</div>\n'
+    '        </div>\n'
+    '    </div>\n'
+)
+
+_HTML_FOOT = (
+    '</body>\n'
+    '</html>'
+)
+
+
+def _summary_counts(analysis: Dict[str, Any], generated_tests: List[str]) -> Dict[str, int]:
+    """Count what was analyzed and generated, for every report format.
+    
+    Args:
+        analysis: Analysis results from code analysis.
+        generated_tests: List of generated test files.
+        
+    Returns:
+        Dictionary of counts keyed like the HTML summary template fields.
+    """
+    return {
+        'file_count': len(analysis.get('files', [])),
+        'function_count': len(analysis.get('functions', [])),
+        'class_count': len(analysis.get('classes', [])),
+        'edge_case_count': len(analysis.get('edge_cases', [])),
+        'failure_mode_count': len(analysis.get('failure_modes', [])),
+        'test_count': len(generated_tests)
+    }
+
+
 class ReportGenerator:
     """Generate detailed reports for test generation and execution."""
     
@@ -28,76 +184,129 @@ class ReportGenerator:
         Returns:
             The generated report as a string.
         """
-        report = []
-        report.append("=" * 70)
-        report.append("SMART TEST GENERATOR REPORT")
-        report.append("=" * 70)
-        report.append(f"Generated: {self.timestamp}")
-        report.append("")
+        return "\n".join(self._iter_report_lines(analysis, generated_tests, test_results))
+    
+    def write(
+        self,
+        output_file: Path,
+        analysis: Dict[str, Any],
+        generated_tests: List[str],
+        test_results: Dict[str, Any]
+    ) -> Path:
+        """Write the text report to a file.
+        
+        Lines are streamed to disk as they are rendered, so the whole
+        report is never held as one string.
+        
+        Args:
+            output_file: Path of the report file to write.
+            analysis: Analysis results from code analysis.
+            generated_tests: List of generated test files.
+            test_results: Test execution results.
+            
+        Returns:
+            Path to the written report.
+        """
+        output_file = Path(output_file)
+        lines = self._iter_report_lines(analysis, generated_tests, test_results)
+        with open(
+            output_file, 'w', encoding='utf-8', newline='\n', buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            # Same layout as generate(): newline-separated, none at the end
+            f.write(next(lines))
+            for line in lines:
+                f.write('\n')
+                f.write(line)
+        
+        return output_file
+    
+    def _iter_report_lines(
+        self,
+        analysis: Dict[str, Any],
+        generated_tests: List[str],
+        test_results: Dict[str, Any]
+    ) -> Iterator[str]:
+        """Render the text report.
+        
+        Args:
+            analysis: Analysis results from code analysis.
+            generated_tests: List of generated test files.
+            test_results: Test execution results.
+            
+        Yields:
+            Lines of the report, without line endings.
+        """
+        counts = _summary_counts(analysis, generated_tests)
+        edge_cases = analysis.get('edge_cases', [])
+        failure_modes = analysis.get('failure_modes', [])
+        
+        yield "=" * 70
+        yield "SMART TEST GENERATOR REPORT"
+        yield "=" * 70
+        yield f"Generated: {self.timestamp}"
+        yield ""
         
         # Analysis Summary
-        report.append("-" * 70)
-        report.append("CODE ANALYSIS SUMMARY")
-        report.append("-" * 70)
-        report.append(f"Files analyzed: {len(analysis.get('files', []))}")
-        report.append(f"Functions found: {len(analysis.get('functions', []))}")
-        report.append(f"Classes found: {len(analysis.get('classes', []))}")
-        report.append(f"Edge cases detected: {len(analysis.get('edge_cases', []))}")
-        report.append(f"Failure modes detected: {len(analysis.get('failure_modes', []))}")
-        report.append("")
+        yield "-" * 70
+        yield "CODE ANALYSIS SUMMARY"
+        yield "-" * 70
+        yield f"Files analyzed: {counts['file_count']}"
+        yield f"Functions found: {counts['function_count']}"
+        yield f"Classes found: {counts['class_count']}"
+        yield f"Edge cases detected: {counts['edge_case_count']}"
+        yield f"Failure modes detected: {counts['failure_mode_count']}"
+        yield ""
         
         # Edge Cases
-        if analysis.get('edge_cases'):
-            report.append("-" * 70)
-            report.append("DETECTED EDGE CASES")
-            report.append("-" * 70)
-            for edge_case in analysis['edge_cases'][:10]:  # Limit to first 10
-                report.append(f"  • {edge_case}")
-            if len(analysis['edge_cases']) > 10:
-                report.append(f"  ... and {len(analysis['edge_cases']) - 10} more")
-            report.append("")
+        if edge_cases:
+            yield "-" * 70
+            yield "DETECTED EDGE CASES"
+            yield "-" * 70
+            for edge_case in edge_cases[:10]:  # Limit to first 10
+                yield f"  • {edge_case}"
+            if counts['edge_case_count'] > 10:
+                yield f"  ... and {counts['edge_case_count'] - 10} more"
+            yield ""
         
         # Failure Modes
-        if analysis.get('failure_modes'):
-            report.append("-" * 70)
-            report.append("DETECTED FAILURE MODES")
-            report.append("-" * 70)
-            for failure_mode in analysis['failure_modes'][:10]:
-                report.append(f"  • {failure_mode}")
-            if len(analysis['failure_modes']) > 10:
-                report.append(f"  ... and {len(analysis['failure_modes']) - 10} more")
-            report.append("")
+        if failure_modes:
+            yield "-" * 70
+            yield "DETECTED FAILURE MODES"
+            yield "-" * 70
+            for failure_mode in failure_modes[:10]:
+                yield f"  • {failure_mode}"
+            if counts['failure_mode_count'] > 10:
+                yield f"  ... and {counts['failure_mode_count'] - 10} more"
+            yield ""
         
         # Generated Tests
-        report.append("-" * 70)
-        report.append("GENERATED TESTS")
-        report.append("-" * 70)
-        report.append(f"Total tests generated: {len(generated_tests)}")
+        yield "-" * 70
+        yield "GENERATED TESTS"
+        yield "-" * 70
+        yield f"Total tests generated: {counts['test_count']}"
         for test_file in generated_tests:
-            report.append(f"  • {test_file}")
-        report.append("")
+            yield f"  • {test_file}"
+        yield ""
         
         # Test Results
         if test_results:
-            report.append("-" * 70)
-            report.append("TEST EXECUTION RESULTS")
-            report.append("-" * 70)
-            report.append(f"Tests passed: {test_results.get('passed', 0)}")
-            report.append(f"Tests failed: {test_results.get('failed', 0)}")
-            report.append(f"Tests skipped: {test_results.get('skipped', 0)}")
+            yield "-" * 70
+            yield "TEST EXECUTION RESULTS"
+            yield "-" * 70
+            yield f"Tests passed: {test_results.get('passed', 0)}"
+            yield f"Tests failed: {test_results.get('failed', 0)}"
+            yield f"Tests skipped: {test_results.get('skipped', 0)}"
             
             if test_results.get('failed_tests'):
-                report.append("")
-                report.append("Failed Tests:")
+                yield ""
+                yield "Failed Tests:"
                 for failed in test_results['failed_tests']:
-                    report.append(f"  ❌ {failed}")
+                    yield f"  ❌ {failed}"
         
-        report.append("")
-        report.append("=" * 70)
-        report.append("END OF REPORT")
-        report.append("=" * 70)
-        
-        return "\n".join(report)
+        yield ""
+        yield "=" * 70
+        yield "END OF REPORT"
+        yield "=" * 70
     
     def generate_json(
         self,
@@ -115,12 +324,14 @@ class ReportGenerator:
         Returns:
             The generated report as a JSON string.
         """
+        counts = _summary_counts(analysis, generated_tests)
+        
         report_data = {
             "timestamp": self.timestamp,
             "analysis": {
                 "files": analysis.get('files', []),
-                "function_count": len(analysis.get('functions', [])),
-                "class_count": len(analysis.get('classes', [])),
+                "function_count": counts['function_count'],
+                "class_count": counts['class_count'],
                 "edge_cases": analysis.get('edge_cases', []),
                 "failure_modes": analysis.get('failure_modes', [])
             },
@@ -146,128 +357,67 @@ class ReportGenerator:
         Returns:
             The generated report as an HTML string.
         """
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Smart Test Generator Report</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #f5f5f5;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }}
-        .section {{
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .stat {{
-            display: inline-block;
-            background: #e8f4f8;
-            padding: 15px 25px;
-            border-radius: 8px;
-            margin: 10px 10px 10px 0;
-        }}
-        .stat-value {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #667eea;
-        }}
-        .stat-label {{
-            color: #666;
-            font-size: 14px;
-        }}
-        .test-pass {{
-            color: #10b981;
-        }}
-        .test-fail {{
-            color: #ef4444;
-        }}
-        ul {{
-            list-style-type: none;
-            padding-left: 0;
-        }}
-        li {{
-            padding: 8px 0;
-            border-bottom: 1px solid #eee;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🚀 Smart Test Generator Report</h1>
-        <p>Generated: {self.timestamp}</p>
-    </div>
+        return ''.join(self._iter_html(analysis, generated_tests, test_results))
     
-    <div class="section">
-        <h2>📊 Analysis Summary</h2>
-        <div class="stat">
-            <div class="stat-value">{len(analysis.get('files', []))}</div>
-            <div class="stat-label">Files Analyzed</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value">{len(analysis.get('functions', []))}</div>
-            <div class="stat-label">Functions</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value">{len(analysis.get('classes', []))}</div>
-            <div class="stat-label">Classes</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value">{len(analysis.get('edge_cases', []))}</div>
-            <div class="stat-label">Edge Cases</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value">{len(analysis.get('failure_modes', []))}</div>
-            <div class="stat-label">Failure Modes</div>
-        </div>
-    </div>
+    def write_html(
+        self,
+        output_file: Path,
+        analysis: Dict[str, Any],
+        generated_tests: List[str],
+        test_results: Dict[str, Any]
+    ) -> Path:
+        """Write an HTML report to a file.
+        
+        The report is streamed to disk fragment by fragment, so the whole
+        document is never held as one string.
+        
+        Args:
+            output_file: Path of the HTML file to write.
+            analysis: Analysis results from code analysis.
+            generated_tests: List of generated test files.
+            test_results: Test execution results.
+            
+        Returns:
+            Path to the written report.
+        """
+        output_file = Path(output_file)
+        with open(
+            output_file, 'w', encoding='utf-8', newline='\n', buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            f.writelines(self._iter_html(analysis, generated_tests, test_results))
+        
+        return output_file
     
-    <div class="section">
-        <h2>📝 Generated Tests</h2>
-        <p>Total: {len(generated_tests)} tests</p>
-        <ul>
-"""
+    def _iter_html(
+        self,
+        analysis: Dict[str, Any],
+        generated_tests: List[str],
+        test_results: Dict[str, Any]
+    ) -> Iterator[str]:
+        """Render the HTML report.
         
+        Args:
+            analysis: Analysis results from code analysis.
+            generated_tests: List of generated test files.
+            test_results: Test execution results.
+            
+        Yields:
+            Consecutive fragments of the HTML document.
+        """
+        yield _HTML_HEAD
+        yield _HTML_SUMMARY_TEMPLATE % {
+            'timestamp': self.timestamp,
+            **_summary_counts(analysis, generated_tests)
+        }
         for test_file in generated_tests:
-            html += f'            <li>📄 {test_file}</li>\n'
-        
-        html += """        </ul>
-    </div>
-"""
+            yield _HTML_TEST_ITEM_TEMPLATE % test_file
+        yield _HTML_TESTS_END
         
         if test_results:
-            html += f"""    <div class="section">
-        <h2>🧪 Test Results</h2>
-        <div class="stat">
-            <div class="stat-value test-pass">{test_results.get('passed', 0)}</div>
-            <div class="stat-label">Passed</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value test-fail">{test_results.get('failed', 0)}</div>
-            <div class="stat-label">Failed</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value">{test_results.get('skipped', 0)}</div>
-            <div class="stat-label">Skipped</div>
-        </div>
-    </div>
-"""
-        
-        html += """</body>
-</html>"""
+            yield _HTML_RESULTS_TEMPLATE % {
+                'passed': test_results.get('passed', 0),
+                'failed': test_results.get('failed', 0),
+                'skipped': test_results.get('skipped', 0)
+            }
         
-        return html
+        yield _HTML_FOOT